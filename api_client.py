@@ -0,0 +1,132 @@
+"""HTTP client for calls from the dashboard to the NourishAI API.
+
+One client is shared by every Streamlit session in the process. It keeps
+pooled keep-alive connections, bounds every call with a timeout and retries
+transient failures with jittered exponential backoff. Identical concurrent
+GETs (e.g. many viewers loading the stats panel at once) are coalesced into
+a single request whose response every caller shares.
+
+HTTP/2 is used when ``http2=True`` and ``httpx`` with the ``h2`` extra is
+installed; otherwise the client falls back to ``requests``.
+"""
+import json
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Statuses worth retrying: the backend is restarting or overloaded
+RETRY_STATUSES = (502, 503, 504)
+
+
+class _Flight:
+    """One in-progress request that other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class ApiClient:
+    def __init__(self, base_url, timeout=(3.05, 10), retries=2, backoff=0.2,
+                 pool_size=32, http2=False):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.http2 = False
+        if http2:
+            self._init_httpx(pool_size)
+        if not self.http2:
+            self._init_requests(pool_size)
+
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'coalesced': 0, 'retries': 0}
+
+    def _init_requests(self, pool_size):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._transient = (requests.ConnectionError, requests.Timeout)
+
+    def _init_httpx(self, pool_size):
+        try:
+            import h2  # noqa: F401 - httpx needs it for HTTP/2
+            import httpx
+        except ImportError:
+            return
+        connect, read = self.timeout
+        self.session = httpx.Client(
+            http2=True,
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        self._transient = (httpx.TransportError,)
+        self.http2 = True
+
+    def _count(self, name):
+        # Shared by every Streamlit session thread; += alone can lose updates
+        with self._lock:
+            self.stats[name] += 1
+
+    def _send(self, method, path, retry=True, **kwargs):
+        """One request with bounded retries on timeouts, dropped connections and 502/503/504"""
+        url = f"{self.base_url}{path}"
+        if not self.http2:
+            kwargs.setdefault('timeout', self.timeout)
+        attempts = self.retries + 1 if retry else 1
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                self._count('requests')
+                response = self.session.request(method, url, **kwargs)
+            except self._transient:
+                if last:
+                    raise
+            else:
+                if last or response.status_code not in RETRY_STATUSES:
+                    return response
+            self._count('retries')
+            # Full jitter, so concurrent viewers do not retry in lockstep
+            time.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    def get(self, path, params=None):
+        """GET ``path``, sharing the response with identical calls already in flight"""
+        key = (path, json.dumps(params or {}, sort_keys=True, default=str))
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.response
+
+        try:
+            flight.response = self._send('GET', path, params=params)
+            return flight.response
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def post(self, path, json=None, idempotent=False):
+        """POST ``path``; retried only when the caller says repeating it is harmless"""
+        return self._send('POST', path, retry=idempotent, json=json)
+
+    def close(self):
+        self.session.close()
+
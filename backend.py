@@ -1,12 +1,30 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ValidationError
+from typing import Dict, List, Optional
 import pandas as pd
 import numpy as np
-import joblib
+import gzip
+import json
+import os
+import threading
+import time
 from datetime import datetime
-from deep_translator import GoogleTranslator
+from export_stream import MEDIA_TYPES, gzip_stream, iter_csv, iter_ndjson, iter_parquet
+from chat_sessions import ChatSessionStore
+from cohort import CohortEngine, CohortQueryError
+from drift_monitor import BASELINE_FILE, DriftMonitor, load_baseline
+from explain import TreePathExplainer, recommendations_from_explanation
+from features import AGE_MONTHS_MAP, encode_frame
+from geo_cube import GeoCube, load_district_lists
+from model_store import load_artifacts, model_version
+from prediction_cache import PredictionCache, QUANTIZATION, quantize
+from recommendations import (CHAT_DETECTED, CHAT_GOOD_DIVERSITY, CHAT_LOW_DIVERSITY, CHAT_TODAY,
+                             generate_recommendations)
+from sync_store import SyncError, SyncStore
+from translation import SUPPORTED_LANGUAGES, TranslatorChain
 
 app = FastAPI(title="NourishAI Intelligence API", version="1.0")
 
@@ -18,48 +36,124 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in prediction cache (NOURISHAI_PREDICTION_CACHE=1)
+prediction_cache = None
+if os.environ.get('NOURISHAI_PREDICTION_CACHE', '0') == '1':
+    prediction_cache = PredictionCache(
+        max_bytes=int(os.environ.get('NOURISHAI_PREDICTION_CACHE_MB', '32')) * 1024 * 1024,
+        ttl=float(os.environ.get('NOURISHAI_PREDICTION_CACHE_TTL', '3600')),
+    )
+
+# Live input drift against the training baseline written by train_model.py
+drift_monitor = None
+if os.path.exists(BASELINE_FILE) and os.environ.get('NOURISHAI_DRIFT_MONITOR', '1') == '1':
+    drift_monitor = DriftMonitor(load_baseline(), window=int(os.environ.get('NOURISHAI_DRIFT_WINDOW', '10000')))
+
+# Per-beneficiary chat sessions with a running daily intake summary. Sessions live in
+# process memory, so serve.py sets this to None: workers would each see part of a day
+CHAT_SESSIONS_UNAVAILABLE = "Daily chat sessions need the single-process server (python backend.py)"
+chat_sessions = ChatSessionStore(
+    max_sessions=int(os.environ.get('NOURISHAI_CHAT_SESSIONS', '10000')),
+    ttl=float(os.environ.get('NOURISHAI_CHAT_TTL', '86400')),
+    log_path=os.environ.get('NOURISHAI_CHAT_LOG'),
+)
+
+# Largest /predict/batch request accepted, keeps per-request latency bounded
+MAX_BATCH_SIZE = 1000
+
+# Latency of explanation requests, reported on /metrics
+explain_lock = threading.Lock()
+explain_stats = {'requests': 0, 'rows': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+
+def load_models():
+    """Load models and encoders, and invalidate anything derived from the old ones"""
+    global score_model, cat_model, le_age, le_region, le_gender, explainer, MODEL_VERSION
+    previous_version = globals().get('MODEL_VERSION')
+
+    version = model_version()
+    artifacts = load_artifacts()
+    score_model = artifacts['score_model']
+    cat_model = artifacts['cat_model']
+    le_age = artifacts['le_age']
+    le_region = artifacts['le_region']
+    le_gender = artifacts['le_gender']
+    MODEL_VERSION = version
+    explainer = TreePathExplainer(score_model)
+
+    if prediction_cache is not None and previous_version is not None:
+        prediction_cache.clear()
+
 # Load models
-score_model = joblib.load('risk_score_model.pkl')
-cat_model = joblib.load('risk_category_model.pkl')
-le_age = joblib.load('encoder_age.pkl')
-le_region = joblib.load('encoder_region.pkl')
-le_gender = joblib.load('encoder_gender.pkl')
+load_models()
 
 # Load beneficiary data
 df = pd.read_csv('beneficiary_data.csv')
 
-# Supported languages
-SUPPORTED_LANGUAGES = {
-    'en': 'English',
-    'hi': 'हिंदी (Hindi)',
-    'ta': 'தமிழ் (Tamil)',
-    'te': 'తెలుగు (Telugu)',
-    'kn': 'ಕನ್ನಡ (Kannada)',
-    'ml': 'മലയാളം (Malayalam)',
-    'mr': 'मराठी (Marathi)',
-    'bn': 'বাংলা (Bengali)',
-    'gu': 'ગુજરાતી (Gujarati)',
-    'pa': 'ਪੰਜਾਬੀ (Punjabi)',
-    'or': 'ଓଡ଼ିଆ (Odia)',
-    'as': 'অসমীয়া (Assamese)',
-    'ur': 'اردو (Urdu)'
-}
+# Per-record versions and change log for delta sync with field devices
+sync_store = SyncStore(df, log_path=os.environ.get('NOURISHAI_SYNC_LOG', 'sync_changes.jsonl'))
+df = sync_store.frame
+sync_lock = threading.Lock()
+
+# Dashboard aggregates keyed by name, tagged with the sync sequence they were built at
+dashboard_cache = {}
+dashboard_lock = threading.Lock()
+
+# Precomputed state -> district roll-ups for drill-down queries
+geo_cube = GeoCube.from_frame(df, load_district_lists())
+
+# Dictionary-encoded columns for ad-hoc cohort queries
+cohort_engine = CohortEngine(df)
+
+
+# Translation backends in fallback order: the offline phrase table, then Google Translate
+translator = TranslatorChain.from_names()
+
+def translate_checked(texts: List[str], target_lang: str = 'en', source_lang: str = 'auto'):
+    """Translate several strings together, with one batch per backend.
+
+    Returns (translations, complete); complete is False when a string was left
+    in the original language because no backend could translate it.
+    """
+    if target_lang == 'en' or target_lang == source_lang or not texts:
+        return list(texts), True
+    return translator.translate_checked(list(texts), target_lang, source_lang)
+
+def localize(groups):
+    """Translate lists of English strings, each to its own language, with one call per language.
+
+    ``groups`` is a list of (language, texts); returns (translations, complete)
+    for each, where complete is False when any of its texts stayed in English.
+    """
+    results = [None] * len(groups)
+    by_language = {}
+    for i, (language, _) in enumerate(groups):
+        by_language.setdefault(language, []).append(i)
+    for language, indices in by_language.items():
+        texts = [text for i in indices for text in groups[i][1]]
+        if language == 'en' or not texts:
+            translated, flags = texts, [True] * len(texts)
+        else:
+            translated, flags = translator.translate_each(texts, language, 'en')
+        start = 0
+        for i in indices:
+            end = start + len(groups[i][1])
+            results[i] = (translated[start:end], all(flags[start:end]))
+            start = end
+    return results
+
+def translate_many(texts: List[str], target_lang: str = 'en', source_lang: str = 'auto') -> List[str]:
+    """Translate several strings together, with one batch per backend"""
+    return translate_checked(texts, target_lang, source_lang)[0]
 
 def translate_text(text: str, target_lang: str = 'en', source_lang: str = 'auto') -> str:
-    """Translate text using Google Translate"""
-    if target_lang == 'en' or target_lang == source_lang:
-        return text
-    try:
-        translator = GoogleTranslator(source=source_lang, target=target_lang)
-        return translator.translate(text)
-    except Exception as e:
-        print(f"Translation error: {e}")
-        return text
+    """Translate text with the configured backends; untranslatable text is returned as is"""
+    return translate_many([text], target_lang, source_lang)[0]
 
 # Models
 class MealInput(BaseModel):
     user_message: str
     language: str = "en"
+    beneficiary_id: Optional[str] = None
 
 class RiskInput(BaseModel):
     age_group: str
@@ -73,12 +167,31 @@ class RiskInput(BaseModel):
     days_since_last_check: int = 0
     language: str = "en"
 
+class CohortQuery(BaseModel):
+    filter: Optional[str] = None
+    group_by: List[str] = []
+    aggregations: Dict[str, List[str]] = {}
+
+class RecordChange(BaseModel):
+    beneficiary_id: str
+    base_version: Optional[int] = None
+    updated_at: Optional[str] = None
+    fields: Dict[str, object]
+
+class SyncRequest(BaseModel):
+    device_id: str
+    since: int = 0
+    # Records per page; at least 1 so that following `more` always makes progress
+    limit: int = Field(500, ge=1, le=5000)
+    changes: List[RecordChange] = []
+
 class RiskPrediction(BaseModel):
     risk_score: float
     risk_category: str
     confidence: float
     recommendations: List[str]
     timestamp: str
+    explanation: Optional[dict] = None
 
 # Helper functions
 def extract_meals_from_text(text):
@@ -116,40 +229,13 @@ def extract_meals_from_text(text):
         'diversity_score': len(detected_groups)
     }
 
-def generate_recommendations(risk_score, input_data):
-    """Generate personalized recommendations"""
-    recs = []
-    
-    if input_data.meals_per_day < 3:
-        recs.append("🍽️ Increase meal frequency to at least 3 times per day")
-    
-    if input_data.food_diversity_score < 4:
-        recs.append("🥗 Add more variety - include vegetables, fruits, and protein sources")
-    
-    if input_data.protein_intake_g < 40:
-        recs.append("🥚 Increase protein through dal, eggs, milk, or soy products")
-    
-    if input_data.attendance_rate < 0.75:
-        recs.append("📅 Improve program attendance for consistent nutrition")
-    
-    if risk_score > 60:
-        recs.append("⚠️ HIGH RISK - Schedule health checkup within 7 days")
-        recs.append("📞 Contact program coordinator immediately")
-    elif risk_score > 40:
-        recs.append("⚡ Monitor closely - recheck within 14 days")
-    
-    if not recs:
-        recs.append("✅ Continue current nutrition plan")
-    
-    return recs
-
 # Routes
 @app.get("/")
 def root():
     return {
         "message": "NourishAI Intelligence API",
         "version": "1.0",
-        "endpoints": ["/predict", "/chat", "/dashboard/stats", "/beneficiaries", "/languages"]
+        "endpoints": ["/predict", "/chat", "/dashboard/stats", "/dashboard/trend", "/dashboard/version", "/beneficiaries", "/languages", "/geo/drilldown", "/analytics/cohort", "/sync", "/drift", "/metrics"]
     }
 
 @app.get("/languages")
@@ -160,60 +246,221 @@ def get_supported_languages():
         "total_count": len(SUPPORTED_LANGUAGES)
     }
 
-@app.post("/predict", response_model=RiskPrediction)
-def predict_risk(input_data: RiskInput):
+def encode_features(input_data):
+    """Build the model feature row for a RiskInput"""
+    age_months = AGE_MONTHS_MAP.get(input_data.age_group, 60)
+
+    age_encoded = le_age.transform([input_data.age_group])[0]
+    region_encoded = le_region.transform([input_data.region])[0]
+    gender_encoded = le_gender.transform([input_data.gender])[0]
+
+    return [
+        age_months,
+        input_data.meals_per_day,
+        input_data.food_diversity_score,
+        input_data.protein_intake_g,
+        input_data.calorie_intake_kcal,
+        input_data.attendance_rate,
+        input_data.days_since_last_check,
+        age_encoded,
+        region_encoded,
+        gender_encoded
+    ]
+
+def normalize_input(input_data):
+    """Strip categorical labels and quantize continuous inputs to cache buckets"""
+    values = input_data.model_dump()
+    for field in ('age_group', 'gender', 'region', 'language'):
+        values[field] = values[field].strip()
+    for field, step in QUANTIZATION.items():
+        values[field] = quantize(values[field], step)
+    return RiskInput(**values)
+
+def prediction_cache_key(input_data):
+    return (
+        MODEL_VERSION,
+        input_data.language,
+        input_data.age_group,
+        input_data.gender,
+        input_data.region,
+        input_data.meals_per_day,
+        input_data.food_diversity_score,
+        input_data.protein_intake_g,
+        input_data.calorie_intake_kcal,
+        input_data.attendance_rate,
+        input_data.days_since_last_check,
+    )
+
+def compute_prediction(input_data):
+    """Run both models for one input; recommendations are left in English"""
+    features = [encode_features(input_data)]
+
+    # Predict
+    risk_score = score_model.predict(features)[0]
+    risk_category = cat_model.predict(features)[0]
+    risk_proba = cat_model.predict_proba(features)[0]
+
+    return build_prediction(input_data, risk_score, risk_category, risk_proba)
+
+def build_prediction(input_data, risk_score, risk_category, risk_proba):
+    return {
+        'risk_score': round(float(risk_score), 1),
+        'risk_category': risk_category,
+        'confidence': round(float(max(risk_proba)) * 100, 1),
+        'recommendations': generate_recommendations(risk_score, input_data),
+    }
+
+def explain_predictions(inputs, features):
+    """Per-feature score contributions, with English advice for the biggest risk drivers"""
+    started = time.perf_counter()
+    explanations = explainer.explain(features)
+    for explanation in explanations:
+        explanation['recommendations'] = recommendations_from_explanation(explanation)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with explain_lock:
+        explain_stats['requests'] += 1
+        explain_stats['rows'] += len(inputs)
+        explain_stats['total_ms'] += elapsed_ms
+        explain_stats['max_ms'] = max(explain_stats['max_ms'], elapsed_ms)
+    return explanations
+
+def localize_recommendations(languages, items):
+    """Translate the recommendations of each result or explanation in place, one batch per
+    language across all of them; returns whether each item was fully translated"""
+    localized = localize([(language, item['recommendations']) for language, item in zip(languages, items)])
+    for item, (recommendations, _) in zip(items, localized):
+        item['recommendations'] = recommendations
+    return [complete for _, complete in localized]
+
+@app.post("/predict", response_model=RiskPrediction, response_model_exclude_none=True)
+def predict_risk(input_data: RiskInput, explain: bool = False):
     """Predict nourishment risk"""
     try:
-        # Encode categorical
-        age_months_map = {
-            '0-2 years': 12,
-            '3-5 years': 48,
-            '6-12 years': 108,
-            '13-18 years': 180
-        }
-        age_months = age_months_map.get(input_data.age_group, 60)
-        
-        age_encoded = le_age.transform([input_data.age_group])[0]
-        region_encoded = le_region.transform([input_data.region])[0]
-        gender_encoded = le_gender.transform([input_data.gender])[0]
-        
-        # Prepare features
-        features = [[
-            age_months,
-            input_data.meals_per_day,
-            input_data.food_diversity_score,
-            input_data.protein_intake_g,
-            input_data.calorie_intake_kcal,
-            input_data.attendance_rate,
-            input_data.days_since_last_check,
-            age_encoded,
-            region_encoded,
-            gender_encoded
-        ]]
-        
-        # Predict
-        risk_score = score_model.predict(features)[0]
-        risk_category = cat_model.predict(features)[0]
-        risk_proba = cat_model.predict_proba(features)[0]
-        
-        # Generate recommendations
-        recommendations_en = generate_recommendations(risk_score, input_data)
-
-        # Translate recommendations to user's language
-        recommendations = [translate_text(rec, target_lang=input_data.language, source_lang='en')
-                         for rec in recommendations_en]
+        if drift_monitor is not None:
+            drift_monitor.record(input_data.model_dump())
+
+        if prediction_cache is not None:
+            input_data = normalize_input(input_data)
+
+        explanation = None
+        if explain:
+            explanation = explain_predictions([input_data], [encode_features(input_data)])[0]
+
+        started = time.perf_counter()
+        result = None
+        if prediction_cache is not None:
+            key = prediction_cache_key(input_data)
+            result = prediction_cache.get(key)
+        hit = result is not None
+        if not hit:
+            result = compute_prediction(input_data)
+
+        # Cached results are already translated; the rest share one translation batch
+        pending = ([] if hit else [result]) + ([explanation] if explain else [])
+        complete = localize_recommendations([input_data.language] * len(pending), pending)
+
+        if prediction_cache is not None:
+            # English fallbacks from a translation outage must not outlive it
+            if not hit and complete[0]:
+                prediction_cache.put(key, result)
+            prediction_cache.record(hit, time.perf_counter() - started)
 
         return RiskPrediction(
-            risk_score=round(float(risk_score), 1),
-            risk_category=risk_category,
-            confidence=round(float(max(risk_proba)) * 100, 1),
-            recommendations=recommendations,
-            timestamp=datetime.now().isoformat()
+            timestamp=datetime.now().isoformat(),
+            explanation=explanation,
+            **result
         )
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/predict/batch", response_model=List[RiskPrediction], response_model_exclude_none=True)
+def predict_risk_batch(inputs: List[RiskInput], explain: bool = False):
+    """Predict nourishment risk for many beneficiaries in one vectorized pass"""
+    if len(inputs) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SIZE} rows per batch")
+    if not inputs:
+        return []
+    try:
+        frame = pd.DataFrame([input_data.model_dump() for input_data in inputs])
+        frame['age_months'] = frame['age_group'].map(AGE_MONTHS_MAP).fillna(60)
+        if drift_monitor is not None:
+            drift_monitor.record_frame(frame)
+        features, valid = encode_frame(frame, le_age, le_region, le_gender)
+        if not valid.all():
+            raise HTTPException(status_code=400,
+                                detail=f"Unknown age group, region or gender in rows {np.flatnonzero(~valid).tolist()}")
+
+        risk_scores = score_model.predict(features)
+        risk_probas = cat_model.predict_proba(features)
+        risk_categories = cat_model.classes_[risk_probas.argmax(axis=1)]
+        explanations = explain_predictions(inputs, features) if explain else [None] * len(inputs)
+        results = [build_prediction(input_data, score, category, proba)
+                   for input_data, score, category, proba in zip(inputs, risk_scores, risk_categories, risk_probas)]
+
+        # Recommendations and advice of every row, one translation batch per language
+        languages = [input_data.language for input_data in inputs]
+        if explain:
+            localize_recommendations(languages * 2, results + explanations)
+        else:
+            localize_recommendations(languages, results)
+
+        timestamp = datetime.now().isoformat()
+        return [
+            RiskPrediction(timestamp=timestamp, explanation=explanation, **result)
+            for result, explanation in zip(results, explanations)
+        ]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def reload_if_changed():
+    """Reload the models if the artifacts on disk differ from the loaded ones"""
+    if model_version() != MODEL_VERSION:
+        load_models()
+
+# Set by serve.py to have every worker reload, not only the one serving the request
+broadcast_reload = None
+
+@app.post("/models/reload")
+def reload_models():
+    """Reload model artifacts from disk"""
+    try:
+        load_models()
+        if broadcast_reload is not None:
+            broadcast_reload()
+        return {"model_version": MODEL_VERSION}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/metrics")
+def get_metrics():
+    """Serving metrics"""
+    return {
+        "model_version": MODEL_VERSION,
+        "prediction_cache": prediction_cache.stats() if prediction_cache is not None else None,
+        "chat_sessions": chat_sessions.stats() if chat_sessions is not None else None,
+        "translation": translator.stats(),
+        "explain": {
+            "requests": explain_stats['requests'],
+            "rows": explain_stats['rows'],
+            "avg_ms_per_row": round(explain_stats['total_ms'] / explain_stats['rows'], 3) if explain_stats['rows'] else 0.0,
+            "max_request_ms": round(explain_stats['max_ms'], 3)
+        }
+    }
+
+@app.get("/drift")
+def get_drift():
+    """Drift of recent /predict inputs from the training data, per feature"""
+    if drift_monitor is None:
+        raise HTTPException(status_code=404, detail=f"Drift monitoring is off (needs {BASELINE_FILE})")
+    try:
+        return drift_monitor.report()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/chat")
 def chat_interface(meal_input: MealInput):
     """Simple chatbot for meal logging with multi-language support"""
@@ -224,16 +471,22 @@ def chat_interface(meal_input: MealInput):
         meal_data = extract_meals_from_text(user_message_en)
 
         # Create response in English
-        message_en = f"I detected {len(meal_data['meals'])} food items covering {meal_data['diversity_score']} food groups."
+        messages_en = [CHAT_DETECTED.format(items=len(meal_data['meals']), groups=meal_data['diversity_score'])]
 
-        if meal_data['diversity_score'] < 3:
-            suggestion_en = "Try to add more variety - include vegetables, fruits, or protein sources."
-        else:
-            suggestion_en = "Good dietary diversity! Keep it up."
+        # With a beneficiary, suggestions follow everything eaten today, not just this message
+        daily = None
+        diversity_score = meal_data['diversity_score']
+        if meal_input.beneficiary_id and chat_sessions is not None:
+            daily = chat_sessions.add_message(meal_input.beneficiary_id, meal_data['meals'], meal_data['food_groups'])
+            diversity_score = daily['diversity_score']
+            messages_en.append(CHAT_TODAY.format(groups=diversity_score, messages=daily['messages']))
+
+        suggestion_en = CHAT_LOW_DIVERSITY if diversity_score < 3 else CHAT_GOOD_DIVERSITY
 
-        # Translate response back to user's language
-        message = translate_text(message_en, target_lang=meal_input.language, source_lang='en')
-        suggestion = translate_text(suggestion_en, target_lang=meal_input.language, source_lang='en')
+        # Translate response back to user's language, all sentences in one batch
+        *messages, suggestion = translate_many(messages_en + [suggestion_en],
+                                               target_lang=meal_input.language, source_lang='en')
+        message = ' '.join(messages)
 
         response = {
             "detected_meals": meal_data['meals'],
@@ -243,55 +496,278 @@ def chat_interface(meal_input: MealInput):
             "suggestion": suggestion,
             "language": meal_input.language
         }
+        if daily is not None:
+            response["daily_summary"] = daily
+        elif meal_input.beneficiary_id:
+            # Answered from this message alone rather than from a partial day
+            response["session_warning"] = CHAT_SESSIONS_UNAVAILABLE
 
         return response
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/chat/sessions/{beneficiary_id}")
+def get_chat_session(beneficiary_id: str):
+    """Today's running intake summary from a beneficiary's chat messages"""
+    if chat_sessions is None:
+        raise HTTPException(status_code=503, detail=CHAT_SESSIONS_UNAVAILABLE)
+    summary = chat_sessions.get(beneficiary_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"No chat session today for {beneficiary_id}")
+    return summary
+
+def dashboard_aggregate(name, build):
+    """Dashboard aggregate ``name``, rebuilt only after the roster changes"""
+    version = sync_store.seq
+    with dashboard_lock:
+        entry = dashboard_cache.get(name)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+    value = build()
+    with dashboard_lock:
+        dashboard_cache[name] = (version, value)
+    return value
+
+@app.get("/dashboard/version")
+def get_dashboard_version():
+    """Roster and model versions; clients cache dashboard data per version"""
+    return {"data_version": sync_store.seq, "model_version": MODEL_VERSION}
+
 @app.get("/dashboard/stats")
 def get_dashboard_stats():
     """Get aggregated statistics"""
     try:
-        # Convert risk_by_age to JSON-serializable format
-        risk_by_age_raw = df.groupby('age_group')['risk_category'].value_counts()
-        risk_by_age = {}
-        for (age, risk), count in risk_by_age_raw.items():
-            if age not in risk_by_age:
-                risk_by_age[age] = {}
-            risk_by_age[age][risk] = int(count)
-
-        stats = {
-            'total_beneficiaries': len(df),
-            'high_risk_count': len(df[df['risk_category'] == 'High']),
-            'medium_risk_count': len(df[df['risk_category'] == 'Medium']),
-            'low_risk_count': len(df[df['risk_category'] == 'Low']),
-            'avg_risk_score': round(df['risk_score'].mean(), 1),
-            'regions': df['region'].unique().tolist(),
-            'region_stats': df.groupby('region').agg({
-                'risk_score': 'mean',
-                'beneficiary_id': 'count'
-            }).round(1).to_dict(),
-            'risk_by_age': risk_by_age
-        }
-        return stats
+        return dashboard_aggregate('stats', build_dashboard_stats)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def build_dashboard_stats():
+    # Convert risk_by_age to JSON-serializable format
+    risk_by_age_raw = df.groupby('age_group', observed=True)['risk_category'].value_counts()
+    risk_by_age = {}
+    for (age, risk), count in risk_by_age_raw.items():
+        if age not in risk_by_age:
+            risk_by_age[age] = {}
+        risk_by_age[age][risk] = int(count)
+
+    stats = {
+        'total_beneficiaries': len(df),
+        'high_risk_count': len(df[df['risk_category'] == 'High']),
+        'medium_risk_count': len(df[df['risk_category'] == 'Medium']),
+        'low_risk_count': len(df[df['risk_category'] == 'Low']),
+        'avg_risk_score': round(df['risk_score'].mean(), 1),
+        'regions': list(df['region'].unique()),
+        'region_stats': df.groupby('region', observed=True).agg({
+            'risk_score': 'mean',
+            'beneficiary_id': 'count'
+        }).round(1).to_dict(),
+        'risk_by_age': risk_by_age
+    }
+    return stats
+
+@app.get("/dashboard/trend")
+def get_dashboard_trend():
+    """Average risk score per day of last update"""
+    try:
+        return dashboard_aggregate('trend', build_dashboard_trend)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def build_dashboard_trend():
+    # Timestamps are 'YYYY-MM-DD HH:MM:SS' strings; the date prefix is enough to group on
+    dates = df['last_updated'].astype(str).str[:10]
+    daily_risk = df['risk_score'].groupby(dates).mean().round(2)
+    return [{'date': date, 'avg_risk': float(avg)} for date, avg in daily_risk.items()]
+
 @app.get("/beneficiaries")
-def get_beneficiaries(risk_category: Optional[str] = None, limit: int = 100):
-    """Get beneficiary list"""
+def get_beneficiaries(response: Response, risk_category: Optional[str] = None, limit: int = 100,
+                      offset: int = 0, sort: Optional[str] = None):
+    """Get beneficiary list, one page at a time.
+
+    ``sort`` names a column, prefixed with ``-`` for descending order. The
+    total number of matching rows is returned in the X-Total-Count header.
+    """
     try:
         filtered_df = df
         if risk_category:
             filtered_df = df[df['risk_category'] == risk_category]
-        
-        return filtered_df.head(limit).to_dict('records')
+
+        if sort:
+            column = sort.lstrip('-')
+            if column not in df.columns:
+                raise HTTPException(status_code=400, detail=f"Unknown sort column: {column}")
+            # Stable sort so pages do not overlap when values tie
+            filtered_df = filtered_df.sort_values(column, ascending=not sort.startswith('-'), kind='stable')
+
+        response.headers['X-Total-Count'] = str(len(filtered_df))
+        page = filtered_df.iloc[max(offset, 0):max(offset, 0) + limit]
+        return page.astype(object).where(page.notna(), None).to_dict('records')
+
+    except HTTPException:
+        raise
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analytics/cohort")
+def cohort_analytics(query: CohortQuery):
+    """Filter, group and aggregate the roster over arbitrary dimensions"""
+    try:
+        started = time.perf_counter()
+        result = cohort_engine.query(query.filter, query.group_by, query.aggregations)
+        result['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    except CohortQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/sync")
+async def sync_records(request: Request):
+    """Exchange changed records with a field device.
+
+    The device pushes the records it changed and receives those changed on
+    the server since its last sync sequence number. Request and response
+    bodies may be gzip-compressed.
+    """
+    body = await request.body()
+    # Decoding and roster updates block, so they run off the event loop
+    return await run_in_threadpool(process_sync, body, request.headers.get('content-encoding'),
+                                   request.headers.get('accept-encoding', ''))
+
+def process_sync(body, content_encoding, accept_encoding):
+    global df
+    try:
+        if content_encoding == 'gzip':
+            body = gzip.decompress(body)
+        sync_request = SyncRequest(**json.loads(body))
+    except (OSError, ValueError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid sync request: {e}")
+
+    try:
+        if sync_request.changes and not sync_store.writable:
+            raise HTTPException(status_code=503,
+                                detail="Sync needs the single-process server (python backend.py)")
+
+        changes = [change.model_dump() for change in sync_request.changes]
+        # One batch at a time, so the derived aggregates see changes in sequence order
+        with sync_lock:
+            accepted, conflicts, positions, previous = sync_store.apply(changes, sync_request.device_id)
+            df = sync_store.frame
+
+            # Keep derived aggregates in step with the touched rows only; a row changed
+            # twice in one batch is removed in its first old state and added once
+            first_seen = {}
+            for position, old_row in zip(positions, previous):
+                first_seen.setdefault(position, old_row)
+            touched = list(first_seen)
+            if touched:
+                for position, old_row in first_seen.items():
+                    if old_row is not None:
+                        geo_cube.remove_rows(old_row, [position])
+                geo_cube.add_rows(df.iloc[touched], touched)
+                cohort_engine.update_rows(df.iloc[touched], touched)
+
+        records, next_since, more = sync_store.changes_since(
+            sync_request.since, sync_request.device_id, sync_request.limit)
+        payload = json.dumps({
+            "seq": sync_store.seq,
+            "next_since": next_since,
+            "more": more,
+            "accepted": accepted,
+            "conflicts": conflicts,
+            "changes": records
+        }, default=str).encode('utf-8')
+
+        if 'gzip' in accept_encoding:
+            return Response(gzip.compress(payload), media_type='application/json',
+                            headers={'Content-Encoding': 'gzip'})
+        return Response(payload, media_type='application/json')
+
+    except HTTPException:
+        raise
+    except SyncError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/geo/drilldown")
+def geo_drilldown(state: Optional[str] = None, district: Optional[str] = None, limit: int = 50):
+    """Risk roll-up for the country, a state or a district, with its children"""
+    try:
+        if state is None:
+            return {"level": "country", **geo_cube.country()}
+
+        if district is None:
+            result = geo_cube.state(state)
+            if result is None:
+                raise HTTPException(status_code=404, detail=f"Unknown state: {state}")
+            return {"level": "state", "state": state, **result}
+
+        result = geo_cube.district(state, district)
+        if result is None:
+            raise HTTPException(status_code=404, detail=f"Unknown district: {district}")
+        summary, positions = result
+        members = df.iloc[positions]
+        members = members.sort_values('risk_score', ascending=False).head(limit)
+        return {
+            "level": "district",
+            "state": state,
+            "district": district,
+            "summary": summary,
+            "beneficiaries": members.to_dict('records')
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/beneficiaries/export")
+def export_beneficiaries(format: str = 'csv', compression: Optional[str] = None,
+                         risk_category: Optional[str] = None, region: Optional[str] = None,
+                         age_group: Optional[str] = None, gender: Optional[str] = None,
+                         columns: Optional[str] = None):
+    """Stream a filtered beneficiary extract as CSV, NDJSON or Parquet"""
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    if compression not in (None, 'gzip'):
+        raise HTTPException(status_code=400, detail=f"Unsupported compression: {compression}")
+
+    selected = columns.split(',') if columns else list(df.columns)
+    unknown = [col for col in selected if col not in df.columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+
+    filters = {'risk_category': risk_category, 'region': region,
+               'age_group': age_group, 'gender': gender}
+    filename = f"beneficiaries.{format}"
+    media_type = MEDIA_TYPES[format]
+
+    if format == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+        # Parquet compresses internally, per column chunk
+        body = iter_parquet(df, filters, selected, compression=compression or 'snappy')
+    else:
+        body = iter_csv(df, filters, selected) if format == 'csv' else iter_ndjson(df, filters, selected)
+        if compression == 'gzip':
+            body = gzip_stream(body)
+            filename += '.gz'
+            media_type = 'application/gzip'
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
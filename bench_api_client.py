@@ -0,0 +1,74 @@
+"""Dashboard page-load latency under concurrent viewers: plain requests vs ApiClient.
+
+Start the API first (python backend.py), then:
+    python bench_api_client.py --viewers 1 8 32 --loads 20
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+import requests
+
+from api_client import ApiClient
+
+# The calls one dashboard render makes when its caches are cold
+PAGE_CALLS = [
+    ('/dashboard/version', None),
+    ('/dashboard/stats', None),
+    ('/dashboard/trend', None),
+    ('/geo/drilldown', None),
+    ('/beneficiaries', {'risk_category': 'High', 'sort': '-risk_score', 'offset': 0, 'limit': 10}),
+]
+
+
+def run(fetch, viewers, loads):
+    """Per-page-load latencies (ms) with ``viewers`` threads loading ``loads`` pages each"""
+    samples = []
+    lock = threading.Lock()
+    start = threading.Barrier(viewers)
+
+    def viewer():
+        start.wait()
+        local = []
+        for _ in range(loads):
+            started = time.perf_counter()
+            for path, params in PAGE_CALLS:
+                fetch(path, params).raise_for_status()
+            local.append((time.perf_counter() - started) * 1000)
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=viewer) for _ in range(viewers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard API client")
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--viewers', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--loads', type=int, default=20)
+    args = parser.parse_args()
+
+    def plain(path, params):
+        return requests.get(f"{args.url}{path}", params=params)
+
+    print(f"{'client':>10} {'viewers':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'coalesced':>10}")
+    for viewers in args.viewers:
+        for name in ('requests', 'ApiClient'):
+            client = ApiClient(args.url, pool_size=max(viewers, 10)) if name == 'ApiClient' else None
+            fetch = client.get if client else plain
+            samples = run(fetch, viewers, args.loads)
+            coalesced = client.stats['coalesced'] if client else 0
+            print(f"{name:>10} {viewers:>8} {np.percentile(samples, 50):>8.1f} "
+                  f"{np.percentile(samples, 95):>8.1f} {np.percentile(samples, 99):>8.1f} {coalesced:>10}")
+            if client:
+                client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Cohort query latency against the equivalent pandas groupby, on a resampled roster.
+
+The roster is resampled to ``--rows`` rows and every query runs uncached.
+
+Usage:
+    python bench_cohort.py --rows 2000000 --repeats 5
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from cohort import CohortEngine
+
+QUERIES = [
+    ('count by region x age x gender', None, ['region', 'age_group', 'gender'], {},
+     lambda f: f.groupby(['region', 'age_group', 'gender']).size()),
+    ('mean protein by region', None, ['region'], {'protein_intake_g': ['mean']},
+     lambda f: f.groupby('region')['protein_intake_g'].mean()),
+    ('median risk by region', None, ['region'], {'risk_score': ['median']},
+     lambda f: f.groupby('region')['risk_score'].median()),
+    ('p90 risk by region', None, ['region'], {'risk_score': ['p90']},
+     lambda f: f.groupby('region')['risk_score'].quantile(0.9)),
+    ('p25/p75 risk by age x gender', None, ['age_group', 'gender'], {'risk_score': ['p25', 'p75']},
+     lambda f: f.groupby(['age_group', 'gender'])['risk_score'].quantile([0.25, 0.75])),
+    ('High risk, median protein by region', "risk_category == 'High'", ['region'],
+     {'protein_intake_g': ['median']},
+     lambda f: f[f['risk_category'] == 'High'].groupby('region')['protein_intake_g'].median()),
+]
+
+
+def timed(fn, repeats):
+    """Median wall time of fn() in milliseconds"""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return float(np.median(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cohort queries")
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    roster = pd.read_csv('beneficiary_data.csv')
+    frame = roster.sample(args.rows, replace=True, random_state=42).reset_index(drop=True)
+    started = time.perf_counter()
+    engine = CohortEngine(frame, cache_entries=0)
+    print(f"{args.rows:,} rows, engine build {(time.perf_counter() - started) * 1000:.0f} ms\n")
+
+    print(f"{'query':<38} {'cohort ms':>10} {'pandas ms':>10}")
+    for label, filter_expression, group_by, aggregations, pandas_query in QUERIES:
+        cohort_ms = timed(lambda: engine.query(filter_expression, group_by, aggregations), args.repeats)
+        pandas_ms = timed(lambda: pandas_query(frame), args.repeats)
+        print(f"{label:<38} {cohort_ms:>10.1f} {pandas_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Measure the latency overhead of explanations on top of plain scoring.
+
+Usage:
+    python bench_explain.py --repeats 200
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from explain import TreePathExplainer
+from features import FEATURE_COLUMNS, encode_frame
+from model_store import load_artifacts
+
+
+def timed(fn, repeats):
+    """Median wall time of fn() in milliseconds"""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return float(np.median(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark explanation overhead")
+    parser.add_argument('--repeats', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    artifacts = load_artifacts()
+    score_model = artifacts['score_model']
+    roster = pd.read_csv('beneficiary_data.csv')
+    features, _ = encode_frame(roster, artifacts['le_age'], artifacts['le_region'], artifacts['le_gender'])
+    frame = pd.DataFrame(features, columns=FEATURE_COLUMNS)
+
+    started = time.perf_counter()
+    explainer = TreePathExplainer(score_model)
+    print(f"Explainer build: {(time.perf_counter() - started) * 1000:.1f} ms "
+          f"({explainer.table.nbytes / 1024:.0f} KB leaf table)\n")
+
+    # Sanity check: base value plus contributions reproduces the model output
+    error = np.abs(score_model.predict(frame) - explainer.base_value
+                   - explainer.contributions(features).sum(axis=1)).max()
+    print(f"Max additivity error: {error:.2e}\n")
+
+    print(f"{'rows':>6} {'predict ms':>11} {'explain ms':>11} {'overhead':>9}")
+    for rows in (1, args.batch_size):
+        batch, batch_frame = features[:rows], frame.iloc[:rows]
+        predict_ms = timed(lambda: score_model.predict(batch_frame), args.repeats)
+        explain_ms = timed(lambda: explainer.contributions(batch), args.repeats)
+        print(f"{rows:>6} {predict_ms:>11.3f} {explain_ms:>11.3f} {explain_ms / predict_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
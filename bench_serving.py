@@ -0,0 +1,180 @@
+"""Benchmark memory and throughput of the API at several worker counts.
+
+Compares the shared mode (``serve.py``: models loaded once, roster memory-mapped,
+workers forked) with independent uvicorn workers that each load their own copy.
+
+Usage:
+    python bench_serving.py --workers 1 4 16 --duration 10
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+PAYLOAD = json.dumps({
+    "age_group": "3-5 years",
+    "gender": "Female",
+    "region": "Maharashtra",
+    "meals_per_day": 2,
+    "food_diversity_score": 3,
+    "protein_intake_g": 25.0,
+    "calorie_intake_kcal": 1200.0,
+    "attendance_rate": 0.75,
+    "days_since_last_check": 15,
+    "language": "en"
+})
+
+
+def process_tree(root_pid):
+    """PIDs of a process and all of its descendants"""
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            parents.setdefault(int(fields[1]), []).append(int(entry))
+        except (FileNotFoundError, ProcessLookupError, IndexError):
+            continue
+
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(parents.get(pid, []))
+    return pids
+
+
+def memory_usage(root_pid):
+    """Total RSS and PSS (in MB) of a process tree.
+
+    RSS counts shared pages once per process; PSS splits them between the
+    processes sharing them, so it is the better measure of real footprint.
+    """
+    rss = pss = 0
+    for pid in process_tree(root_pid):
+        try:
+            with open(f'/proc/{pid}/smaps_rollup') as f:
+                for line in f:
+                    if line.startswith('Rss:'):
+                        rss += int(line.split()[1])
+                    elif line.startswith('Pss:'):
+                        pss += int(line.split()[1])
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+    return rss / 1024, pss / 1024
+
+
+def wait_until_ready(port, expected_processes, proc, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/')
+            conn.getresponse().read()
+            conn.close()
+            # All workers must have finished importing before memory is sampled
+            if len(process_tree(proc.pid)) >= expected_processes:
+                time.sleep(2)
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("server did not become ready in time")
+
+
+def client_loop(args):
+    port, duration = args
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    headers = {'Content-Type': 'application/json'}
+    done = errors = 0
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        try:
+            conn.request('POST', '/predict', body=PAYLOAD, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status == 200:
+                done += 1
+            else:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    conn.close()
+    return done, errors
+
+
+def start_server(mode, workers, port):
+    if mode == 'shared':
+        cmd = [sys.executable, 'serve.py', '--workers', str(workers), '--port', str(port)]
+    else:
+        cmd = [sys.executable, '-m', 'uvicorn', 'backend:app', '--workers', str(workers),
+               '--port', str(port), '--log-level', 'warning', '--no-access-log']
+    return subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def run_case(mode, workers, port, clients, duration):
+    proc = start_server(mode, workers, port)
+    try:
+        # uvicorn runs a single worker in-process instead of under a supervisor
+        expected_processes = 1 if mode == 'independent' and workers == 1 else workers + 1
+        wait_until_ready(port, expected_processes, proc)
+        idle_rss, idle_pss = memory_usage(proc.pid)
+
+        with multiprocessing.Pool(clients) as pool:
+            results = pool.map(client_loop, [(port, duration)] * clients)
+        done = sum(r[0] for r in results)
+        errors = sum(r[1] for r in results)
+
+        load_rss, load_pss = memory_usage(proc.pid)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    return {
+        'mode': mode,
+        'workers': workers,
+        'rss_mb': round(load_rss, 1),
+        'pss_mb': round(load_pss, 1),
+        'idle_pss_mb': round(idle_pss, 1),
+        'req_per_sec': round(done / duration, 1),
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark multi-process serving")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--modes', nargs='+', default=['shared', 'independent'],
+                        choices=['shared', 'independent'])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes:
+        for workers in args.workers:
+            print(f"Running {mode} mode with {workers} workers...", flush=True)
+            results.append(run_case(mode, workers, args.port, args.clients, args.duration))
+
+    print(f"\n{'mode':<12} {'workers':>7} {'RSS MB':>9} {'PSS MB':>9} {'idle PSS':>9} {'req/s':>9} {'errors':>7}")
+    for r in results:
+        print(f"{r['mode']:<12} {r['workers']:>7} {r['rss_mb']:>9} {r['pss_mb']:>9} "
+              f"{r['idle_pss_mb']:>9} {r['req_per_sec']:>9} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Translation throughput of each backend, one string per call and one call per response.
+
+Replays responses shaped like the API's (recommendation lists and chat replies
+in random supported languages) through each configured backend chain. Google
+Translate needs network access; when it is unreachable its rows show the
+strings that fell through untranslated.
+
+Usage:
+    python bench_translation.py --responses 200 --chains phrases google phrases,google
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from recommendations import (CHAT_DETECTED, CHAT_GOOD_DIVERSITY, CHAT_LOW_DIVERSITY, CHAT_TODAY, INPUT_RULES,
+                             SCORE_RULES, all_messages)
+from translation import PHRASE_TABLE_FILE, GoogleTranslateBackend, PhraseTableTranslator, TranslatorChain
+
+
+def build_responses(count, languages, seed=42):
+    """(language, English strings) for a mix of /predict and /chat responses"""
+    rng = random.Random(seed)
+    rule_messages = [message for _, _, message in INPUT_RULES]
+    responses = []
+    for _ in range(count):
+        lang = rng.choice(languages)
+        if rng.random() < 0.5:
+            texts = rng.sample(rule_messages, rng.randint(1, len(rule_messages)))
+            texts += rng.choice(SCORE_RULES)[1]
+        else:
+            groups = rng.randint(1, 6)
+            texts = [CHAT_DETECTED.format(items=rng.randint(1, 8), groups=groups),
+                     CHAT_TODAY.format(groups=groups, messages=rng.randint(1, 5)),
+                     CHAT_LOW_DIVERSITY if groups < 3 else CHAT_GOOD_DIVERSITY]
+        responses.append((lang, texts))
+    return responses
+
+
+def make_chain(names, table, batch):
+    backends = []
+    for name in names.split(','):
+        if name == 'phrases':
+            backends.append(PhraseTableTranslator(table))
+        elif name == 'google':
+            backends.append(GoogleTranslateBackend(batch=batch))
+        else:
+            raise ValueError(f"Unknown translator {name}")
+    return TranslatorChain(backends)
+
+
+def run(chain, responses, batch):
+    """Per-response latencies (ms)"""
+    samples = []
+    for lang, texts in responses:
+        started = time.perf_counter()
+        if batch:
+            chain.translate_batch(texts, lang, 'en')
+        else:
+            for text in texts:
+                chain.translate_batch([text], lang, 'en')
+        samples.append((time.perf_counter() - started) * 1000)
+    return np.array(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark translation backends")
+    parser.add_argument('--responses', type=int, default=200)
+    parser.add_argument('--chains', nargs='+', default=['phrases', 'google', 'phrases,google'],
+                        help="Backend chains in fallback order")
+    parser.add_argument('--phrase-table', default=PHRASE_TABLE_FILE)
+    args = parser.parse_args()
+
+    table = PhraseTableTranslator.from_file(args.phrase_table).table
+    if not table:
+        print(f"[WARN] {args.phrase_table} not found; run build_phrase_table.py first")
+    languages = sorted(table) or ['hi', 'ta', 'bn']
+    responses = build_responses(args.responses, languages)
+    strings = sum(len(texts) for _, texts in responses)
+    print(f"{len(responses)} responses, {strings} strings, {len(all_messages())} rule messages, "
+          f"{len(languages)} languages\n")
+
+    print(f"{'chain':>16} {'mode':>7} {'strings/s':>10} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'requests':>9} {'untranslated':>13}")
+    for names in args.chains:
+        for batch in (False, True):
+            chain = make_chain(names, table, batch)
+            samples = run(chain, responses, batch)
+            stats = chain.stats()
+            requests = stats['backends'].get('google', {}).get('requests', 0)
+            mode = 'batch' if batch else 'single'
+            print(f"{names:>16} {mode:>7} {strings / (samples.sum() / 1000):>10.0f} "
+                  f"{np.percentile(samples, 50):>8.3f} {np.percentile(samples, 95):>8.3f} "
+                  f"{requests:>9} {stats['untranslated']:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Build the phrase table used by the offline ``phrases`` translation backend.
+
+Collects every message the API can send (recommendation rules, explanation
+advice and chat replies, from ``recommendations.api_messages``) and fills in
+any translation missing from ``translations.json``. Entries already in the
+file are kept, so reviewed or hand-corrected translations survive a rebuild;
+``--refresh`` retranslates them anyway.
+Missing entries can be seeded from an edge artifact (``--from-edge``), and
+the rest are requested from Google Translate one message at a time.
+Templates keep their ``{placeholders}``; a translation that loses one is
+left out and reported.
+
+Usage:
+    python build_phrase_table.py --from-edge nourishai_edge.npz
+"""
+import argparse
+import json
+import re
+
+import numpy as np
+
+from recommendations import api_messages
+from translation import (PHRASE_TABLE_FILE, SUPPORTED_LANGUAGES, GoogleTranslateBackend, load_phrase_table,
+                         placeholders, save_phrase_table)
+
+
+def edge_translations(path):
+    """The {language: {english: translated}} table inside an export_edge.py artifact"""
+    with np.load(path, allow_pickle=False) as artifact:
+        return json.loads(str(artifact['meta']))['translations']
+
+
+def translate_template(google, template, lang):
+    """Translate with placeholders swapped for {0}, {1}..., which the service leaves alone"""
+    names = placeholders(template)
+    text = template
+    for i, name in enumerate(names):
+        text = text.replace(f'{{{name}}}', f'{{{i}}}')
+    translated = google.translate_batch([text], lang, 'en')[0]
+    if translated is None:
+        return None
+    if sorted(re.findall(r'\{(\d+)\}', translated)) != [str(i) for i in range(len(names))]:
+        return None
+    for i, name in enumerate(names):
+        translated = translated.replace(f'{{{i}}}', f'{{{name}}}')
+    return translated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline translation phrase table")
+    parser.add_argument('--output', default=PHRASE_TABLE_FILE)
+    parser.add_argument('--from-edge', help="Seed missing rule translations from an edge artifact")
+    parser.add_argument('--languages', nargs='+', help="Language codes (default: all supported)")
+    parser.add_argument('--refresh', action='store_true', help="Retranslate entries already in the table")
+    args = parser.parse_args()
+
+    languages = args.languages or [lang for lang in SUPPORTED_LANGUAGES if lang != 'en']
+    messages = api_messages()
+    table = {} if args.refresh else load_phrase_table(args.output)
+    seed = edge_translations(args.from_edge) if args.from_edge else {}
+    google = GoogleTranslateBackend(batch=False, retry_after=0)
+
+    added, missing = 0, []
+    for lang in languages:
+        phrases = table.setdefault(lang, {})
+        for message in messages:
+            if message in phrases:
+                continue
+            translated = seed.get(lang, {}).get(message)
+            # The edge export falls back to English when it could not translate
+            if translated is None or translated == message:
+                translated = translate_template(google, message, lang)
+            if translated is None:
+                missing.append((lang, message))
+                continue
+            phrases[message] = translated
+            added += 1
+
+    save_phrase_table(table, args.output)
+    total = sum(len(phrases) for phrases in table.values())
+    print(f"[OK] Phrase table saved to: {args.output} ({total} phrases, {added} new)")
+    if missing:
+        print(f"[WARN] {len(missing)} messages not translated; they fall through to the next backend:")
+        for lang, message in missing[:10]:
+            print(f"   {lang}: {message}")
+
+
+if __name__ == "__main__":
+    main()
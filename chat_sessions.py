@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+# Approximate protein (g) and energy (kcal) per typical serving of each food the chat detects
+SERVING_NUTRIENTS = {
+    'rice': (4.0, 200.0),       # 1 cup cooked
+    'roti': (3.0, 100.0),       # 1 roti
+    'chapati': (3.0, 100.0),
+    'dal': (9.0, 150.0),        # 1 katori
+    'lentils': (9.0, 150.0),
+    'sabzi': (2.0, 80.0),       # 1 katori
+    'vegetables': (2.0, 80.0),
+    'fruit': (0.5, 60.0),
+    'banana': (1.3, 105.0),
+    'apple': (0.5, 95.0),
+    'milk': (6.5, 130.0),       # 1 glass
+    'curd': (3.5, 60.0),        # 1 katori
+    'egg': (6.0, 75.0),
+    'chicken': (19.0, 125.0),   # 75 g
+    'fish': (15.0, 90.0),       # 75 g
+}
+
+
+class ChatSessionStore:
+    """Per-beneficiary chat sessions holding a running summary of the day's intake.
+
+    Each message adds its foods to the session's counters, so a turn costs
+    the size of the message rather than the day's history. Sessions idle for
+    longer than ``ttl`` seconds are evicted, and the least recently used ones
+    go once ``max_sessions`` is reached. With ``log_path`` every message is
+    appended to a JSONL log and today's entries are replayed at startup.
+    """
+
+    def __init__(self, max_sessions=10000, ttl=86400, log_path=None):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.log_path = log_path
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+        if log_path and os.path.exists(log_path):
+            self._replay(log_path)
+
+    def _replay(self, path):
+        """Rebuild today's sessions, and drop older entries from the log"""
+        today = date.today().isoformat()
+        with open(path, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        entries = [entry for entry in entries if entry['day'] == today]
+        for entry in entries:
+            self._add(entry['beneficiary_id'], entry['day'], entry['meals'], entry['food_groups'], entry['time'])
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, path)
+
+    def _new_session(self, beneficiary_id, day):
+        return {'beneficiary_id': beneficiary_id, 'day': day, 'messages': 0, 'foods': {},
+                'food_groups': set(), 'protein_g': 0.0, 'calories_kcal': 0.0, 'last_seen': 0.0}
+
+    def _evict(self, now):
+        # Sessions are kept in last-used order, so idle ones are at the front
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if len(self._sessions) <= self.max_sessions and now - oldest['last_seen'] <= self.ttl:
+                break
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+
+    def _add(self, beneficiary_id, day, meals, food_groups, now):
+        session = self._sessions.pop(beneficiary_id, None)
+        if session is None or session['day'] != day:
+            session = self._new_session(beneficiary_id, day)
+        for meal in meals:
+            session['foods'][meal] = session['foods'].get(meal, 0) + 1
+            protein, calories = SERVING_NUTRIENTS.get(meal, (0.0, 0.0))
+            session['protein_g'] += protein
+            session['calories_kcal'] += calories
+        session['food_groups'].update(food_groups)
+        session['messages'] += 1
+        session['last_seen'] = now
+        self._sessions[beneficiary_id] = session
+        self._evict(now)
+        return session
+
+    @staticmethod
+    def _summary(session):
+        return {
+            'beneficiary_id': session['beneficiary_id'],
+            'date': session['day'],
+            'messages': session['messages'],
+            'foods': dict(session['foods']),
+            'food_groups': sorted(session['food_groups']),
+            'diversity_score': len(session['food_groups']),
+            'protein_g': round(session['protein_g'], 1),
+            'calories_kcal': round(session['calories_kcal']),
+        }
+
+    def add_message(self, beneficiary_id, meals, food_groups):
+        """Add one message's detected foods; returns the updated daily summary"""
+        now = time.time()
+        day = date.today().isoformat()
+        with self._lock:
+            session = self._add(beneficiary_id, day, meals, food_groups, now)
+            summary = self._summary(session)
+            if self.log_path:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'beneficiary_id': beneficiary_id, 'day': day, 'time': now,
+                                        'meals': meals, 'food_groups': list(food_groups)},
+                                       ensure_ascii=False) + '\n')
+        return summary
+
+    def get(self, beneficiary_id):
+        """Today's summary for a beneficiary, or None"""
+        with self._lock:
+            session = self._sessions.get(beneficiary_id)
+            if session is None or session['day'] != date.today().isoformat() \
+                    or time.time() - session['last_seen'] > self.ttl:
+                return None
+            return self._summary(session)
+
+    def stats(self):
+        with self._lock:
+            return {'sessions': len(self._sessions), 'max_sessions': self.max_sessions,
+                    'ttl_seconds': self.ttl, 'evictions': self.evictions}
@@ -0,0 +1,312 @@
+import ast
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+AGGREGATIONS = ['count', 'sum', 'mean', 'std', 'min', 'max', 'median', 'p25', 'p75', 'p90']
+_PERCENTILES = {'median': 0.5, 'p25': 0.25, 'p75': 0.75, 'p90': 0.9}
+_ORDER_STATISTICS = ('min', 'max', 'median', 'p25', 'p75', 'p90')
+# Key spaces up to this size are grouped by counting slots instead of sorting keys
+_DENSE_KEY_SPACE = 1 << 20
+# Up to this many groups, each group's slice is sorted on its own after a radix pass
+_SEGMENT_SORT_GROUPS = 4096
+
+
+def _sort_within_groups(values, inverse, counts):
+    """Values ordered by group id, then by value within each group (NaN last)"""
+    # Stable sorts of 8- and 16-bit integers are radix sorts
+    if len(counts) <= 1 << 8:
+        ids = inverse.astype(np.uint8)
+    elif len(counts) <= 1 << 16:
+        ids = inverse.astype(np.uint16)
+    else:
+        ids = inverse
+    if len(counts) > _SEGMENT_SORT_GROUPS:
+        by_value = np.argsort(values)
+        return values[by_value[np.argsort(ids[by_value], kind='stable')]]
+    ordered = values[np.argsort(ids, kind='stable')]
+    start = 0
+    for end in np.cumsum(counts).astype(np.int64):
+        # numpy's vectorized float sort beats np.partition on slices this size
+        ordered[start:end].sort()
+        start = end
+    return ordered
+
+
+class CohortQueryError(ValueError):
+    """Raised for filters, dimensions or aggregations the engine cannot run"""
+
+
+class CohortEngine:
+    """Vectorized filter / group-by / aggregate over the roster.
+
+    Text columns are dictionary-encoded once (integer codes plus a small
+    category list), so filters compare integers and group keys are built by
+    combining codes arithmetically. Aggregates use bincount; order statistics
+    use a radix pass by group and a sort within each group. Results are
+    cached per query and data version.
+    """
+
+    def __init__(self, frame, cache_entries=256):
+        self.rows = len(frame)
+        self.codes = {}
+        self.categories = {}
+        # value -> code for each text column, so updates and filters avoid list scans
+        self.lookup = {}
+        self.numeric = {}
+        for col in frame.columns:
+            series = frame[col]
+            if pd.api.types.is_numeric_dtype(series):
+                self.numeric[col] = series.to_numpy(dtype=np.float64)
+            else:
+                cat = pd.Categorical(series.astype(str))
+                self.codes[col] = cat.codes.astype(np.int32)
+                self.categories[col] = list(cat.categories)
+                self.lookup[col] = {value: code for code, value in enumerate(self.categories[col])}
+        self.version = 0
+        self._cache = OrderedDict()
+        self._cache_entries = cache_entries
+        self._lock = threading.Lock()
+
+    def update_rows(self, frame, positions):
+        """Overwrite (or append, for positions past the end) the given roster rows"""
+        positions = np.asarray(positions, dtype=np.int64)
+        if not len(positions):
+            return
+        new_rows = max(self.rows, int(positions.max()) + 1)
+        with self._lock:
+            for name in self.numeric:
+                column = self.numeric[name]
+                if new_rows > len(column):
+                    column = np.concatenate([column, np.full(new_rows - len(column), np.nan)])
+                column[positions] = frame[name].to_numpy(dtype=np.float64)
+                self.numeric[name] = column
+            for name in self.codes:
+                codes, categories, lookup = self.codes[name], self.categories[name], self.lookup[name]
+                if new_rows > len(codes):
+                    codes = np.concatenate([codes, np.full(new_rows - len(codes), -1, dtype=np.int32)])
+                for position, value in zip(positions, frame[name].astype(str)):
+                    code = lookup.get(value)
+                    if code is None:
+                        code = lookup[value] = len(categories)
+                        categories.append(value)
+                    codes[position] = code
+                self.codes[name] = codes
+            self.rows = new_rows
+            self.version += 1
+            self._cache.clear()
+
+    # Filters
+
+    def _column(self, name):
+        if name in self.numeric:
+            return self.numeric[name]
+        if name in self.codes:
+            return self.codes[name]
+        raise CohortQueryError(f"Unknown column: {name}")
+
+    def _encode_value(self, name, value):
+        """Translate a literal to the column's representation (-1 if never seen)"""
+        if name in self.codes:
+            return self.lookup[name].get(str(value), -1)
+        if isinstance(value, str):
+            raise CohortQueryError(f"Column {name} is numeric; got {value!r}")
+        return value
+
+    def _compare(self, name, op, value):
+        column = self._column(name)
+        if isinstance(op, (ast.In, ast.NotIn)):
+            if not isinstance(value, (list, tuple)):
+                raise CohortQueryError("'in' needs a list of values")
+            mask = np.isin(column, [self._encode_value(name, v) for v in value])
+            return ~mask if isinstance(op, ast.NotIn) else mask
+
+        if name in self.codes and not isinstance(op, (ast.Eq, ast.NotEq)):
+            raise CohortQueryError(f"Only ==, !=, in and not in are supported for {name}")
+        encoded = self._encode_value(name, value)
+        if isinstance(op, ast.Eq):
+            return column == encoded
+        if isinstance(op, ast.NotEq):
+            return column != encoded
+        if isinstance(op, ast.Lt):
+            return column < encoded
+        if isinstance(op, ast.LtE):
+            return column <= encoded
+        if isinstance(op, ast.Gt):
+            return column > encoded
+        if isinstance(op, ast.GtE):
+            return column >= encoded
+        raise CohortQueryError(f"Unsupported operator: {type(op).__name__}")
+
+    def _evaluate(self, node):
+        if isinstance(node, ast.BoolOp):
+            masks = [self._evaluate(v) for v in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return combine.reduce(masks)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ~self._evaluate(node.operand)
+        if isinstance(node, ast.Compare):
+            mask = np.ones(self.rows, dtype=bool)
+            left = node.left
+            for op, right in zip(node.ops, node.comparators):
+                if isinstance(left, ast.Name):
+                    mask &= self._compare(left.id, op, ast.literal_eval(right))
+                elif isinstance(right, ast.Name):
+                    # Literal on the left, e.g. 40 < protein_intake_g
+                    mirrored = {ast.Lt: ast.Gt, ast.LtE: ast.GtE, ast.Gt: ast.Lt, ast.GtE: ast.LtE,
+                                ast.Eq: ast.Eq, ast.NotEq: ast.NotEq}
+                    if type(op) not in mirrored:
+                        raise CohortQueryError("Column must be on the left of 'in'")
+                    mask &= self._compare(right.id, mirrored[type(op)](), ast.literal_eval(left))
+                else:
+                    raise CohortQueryError("Each comparison needs a column name")
+                left = right
+            return mask
+        raise CohortQueryError(f"Unsupported expression: {ast.dump(node)}")
+
+    def filter_mask(self, expression):
+        """Boolean row mask for a filter such as ``region == 'Bihar' and age_months < 60``"""
+        if not expression:
+            return np.ones(self.rows, dtype=bool)
+        try:
+            tree = ast.parse(expression, mode='eval')
+        except SyntaxError as e:
+            raise CohortQueryError(f"Invalid filter: {e.msg}")
+        try:
+            return self._evaluate(tree.body)
+        except (ValueError, TypeError) as e:
+            if isinstance(e, CohortQueryError):
+                raise
+            raise CohortQueryError(f"Invalid filter: {e}")
+
+    # Group-by
+
+    def _group_keys(self, group_by, mask):
+        """Dense group ids for the selected rows and the label of each group"""
+        # Unfiltered queries read the columns in place instead of copying them through the mask
+        every_row = bool(mask.all())
+        columns, labels = [], []
+        for name in group_by:
+            if name in self.codes:
+                codes = self.codes[name] if every_row else self.codes[name][mask]
+                values = self.categories[name]
+            else:
+                column = self._column(name)
+                uniques, codes = np.unique(column if every_row else column[mask], return_inverse=True)
+                values = [int(v) if float(v).is_integer() else v.item() for v in uniques]
+            columns.append(codes)
+            labels.append(values)
+        sizes = [len(values) for values in labels]
+
+        space = np.prod(sizes, dtype=object)
+        if space <= np.iinfo(np.int64).max:
+            # Pack each row's codes into one int64 key
+            key = np.zeros(int(mask.sum()), dtype=np.int64)
+            for codes, size in zip(columns, sizes):
+                key *= size
+                key += codes
+            if space <= _DENSE_KEY_SPACE:
+                # Small key spaces: count every slot, then number the non-empty ones
+                group_ids = np.flatnonzero(np.bincount(key, minlength=int(space)))
+                if len(group_ids) == space:
+                    inverse = key
+                else:
+                    dense = np.zeros(int(space), dtype=np.int64)
+                    dense[group_ids] = np.arange(len(group_ids))
+                    inverse = dense[key]
+            else:
+                group_ids, inverse = np.unique(key, return_inverse=True)
+            # Decode each combined key back into per-dimension codes
+            group_codes = np.empty((len(group_ids), len(sizes)), dtype=np.int64)
+            for i in reversed(range(len(sizes))):
+                group_ids, group_codes[:, i] = np.divmod(group_ids, sizes[i])
+        else:
+            # A packed key would overflow int64 and silently merge groups
+            group_codes, inverse = np.unique(np.stack(columns, axis=1), axis=0, return_inverse=True)
+
+        rows = [dict(zip(group_by, (values[code] for values, code in zip(labels, combo))))
+                for combo in group_codes]
+        return inverse.reshape(-1), rows
+
+    def _aggregate(self, func, values, inverse, n_groups, counts, ordered=None):
+        if func == 'count':
+            return counts
+        if func in ('sum', 'mean', 'std'):
+            sums = np.bincount(inverse, weights=values, minlength=n_groups)
+            if func == 'sum':
+                return sums
+            means = sums / counts
+            if func == 'mean':
+                return means
+            # Sample standard deviation (ddof=1), undefined for single-row groups
+            squares = np.bincount(inverse, weights=values * values, minlength=n_groups)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                variance = (squares - counts * means * means) / (counts - 1)
+            return np.sqrt(np.maximum(variance, 0.0))
+
+        # Order statistics: index into the values sorted within each group
+        if ordered is None:
+            ordered = _sort_within_groups(values, inverse, counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+        if func == 'min':
+            return ordered[starts]
+        if func == 'max':
+            return ordered[starts + counts.astype(np.int64) - 1]
+        position = starts + (counts - 1) * _PERCENTILES[func]
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    def query(self, filter_expression=None, group_by=None, aggregations=None):
+        """Run a cohort query, returning cached results when available.
+
+        ``aggregations`` maps numeric column names to lists of functions from
+        AGGREGATIONS; a ``count`` per group is always included.
+        """
+        group_by = list(group_by or [])
+        aggregations = aggregations or {}
+        cache_key = json.dumps([self.version, filter_expression, group_by, aggregations], sort_keys=True)
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return dict(self._cache[cache_key], cached=True)
+
+        for name in group_by:
+            self._column(name)
+        for name, funcs in aggregations.items():
+            if name not in self.numeric:
+                raise CohortQueryError(f"Aggregations need a numeric column; got {name}")
+            unknown = [f for f in funcs if f not in AGGREGATIONS]
+            if unknown:
+                raise CohortQueryError(f"Unknown aggregations: {', '.join(unknown)}")
+
+        mask = self.filter_mask(filter_expression)
+        matched = int(mask.sum())
+        groups = []
+        if matched:
+            inverse, groups = self._group_keys(group_by, mask)
+            counts = np.bincount(inverse, minlength=len(groups)).astype(np.float64)
+            for group, count in zip(groups, counts):
+                group['count'] = int(count)
+            for name, funcs in aggregations.items():
+                values = self.numeric[name] if matched == self.rows else self.numeric[name][mask]
+                # One sort serves every order statistic of the column
+                ordered = None
+                if any(func in _ORDER_STATISTICS for func in funcs):
+                    ordered = _sort_within_groups(values, inverse, counts)
+                for func in funcs:
+                    if func == 'count':
+                        continue
+                    result = self._aggregate(func, values, inverse, len(groups), counts, ordered)
+                    for group, value in zip(groups, result):
+                        group[f'{name}_{func}'] = round(float(value), 3) if np.isfinite(value) else None
+
+        result = {'rows_matched': matched, 'groups': groups}
+        with self._lock:
+            self._cache[cache_key] = result
+            while len(self._cache) > self._cache_entries:
+                self._cache.popitem(last=False)
+        return dict(result, cached=False)
@@ -4,8 +4,10 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import requests
+import os
 from datetime import datetime
 import streamlit.components.v1 as components
+from api_client import ApiClient
 
 st.set_page_config(page_title="NourishAI Intelligence", layout="wide", page_icon="🍎")
 
@@ -43,6 +45,13 @@ st.markdown("""
 # API endpoint
 API_URL = "http://localhost:8000"
 
+@st.cache_resource
+def get_api():
+    """Pooled API client shared by every viewer session"""
+    return ApiClient(API_URL, http2=os.environ.get('NOURISHAI_API_HTTP2') == '1')
+
+api = get_api()
+
 # Supported languages
 LANGUAGES = {
     'en': 'English',
@@ -166,28 +175,70 @@ def voice_input_component(language_code='en-IN', placeholder="Speak...", key="vo
     """
     return components.html(html_code, height=200)
 
-# Load data
-@st.cache_data(ttl=60)
-def load_data():
-    return pd.read_csv('beneficiary_data.csv')
+# API data. Roster-derived panels are cached per data version (the sync
+# sequence number), so reruns are served from cache until the roster changes.
+PAGE_SIZE = 10
+
+@st.cache_data(ttl=5)
+def get_data_version():
+    response = api.get("/dashboard/version")
+    return response.json()['data_version']
 
-@st.cache_data(ttl=60)
-def get_stats():
-    response = requests.get(f"{API_URL}/dashboard/stats")
+@st.cache_data(max_entries=4)
+def get_stats(data_version):
+    response = api.get("/dashboard/stats")
     return response.json()
 
+@st.cache_data(max_entries=4)
+def get_trend(data_version):
+    response = api.get("/dashboard/trend")
+    return pd.DataFrame(response.json(), columns=['date', 'avg_risk'])
+
+@st.cache_data(max_entries=256)
+def get_geo(data_version, state=None, district=None):
+    params = {'state': state, 'district': district}
+    response = api.get("/geo/drilldown", params={k: v for k, v in params.items() if v})
+    return response.json()
+
+@st.cache_data(max_entries=256)
+def get_beneficiaries_page(data_version, risk_category, page, sort='-risk_score'):
+    """One page of beneficiaries and the total number of matches"""
+    params = {'risk_category': risk_category, 'sort': sort,
+              'offset': page * PAGE_SIZE, 'limit': PAGE_SIZE}
+    response = api.get("/beneficiaries", params=params)
+    return response.json(), int(response.headers.get('X-Total-Count', 0))
+
+# India state boundaries for the choropleth
+INDIA_STATES_GEOJSON = "https://gist.githubusercontent.com/jbrobst/56c13bbbf9d97d187fea01ca62ea5112/raw/e388c4cae20aa53cb5090210a42ebb9b765c0a36/india_states.geojson"
+
+# Roster/NFHS state names that differ from the GeoJSON ones
+GEOJSON_STATE_NAMES = {
+    'NCT Delhi': 'Delhi',
+    'Jammu and Kashmir': 'Jammu & Kashmir',
+    'Andaman and Nicobar Island': 'Andaman & Nicobar',
+}
+
+@st.cache_data(ttl=3600)
+def load_india_geojson():
+    try:
+        return requests.get(INDIA_STATES_GEOJSON, timeout=10).json()
+    except Exception:
+        return None
+
 # Header
 st.markdown('<div class="main-header">🍎 NourishAI Intelligence Dashboard</div>', unsafe_allow_html=True)
 st.markdown("**Real-time Nourishment Risk Intelligence for Food Programs**")
 st.markdown("---")
 
-# Tabs
-tab1, tab2, tab3 = st.tabs(["📊 Dashboard", "💬 Beneficiary Chat", "🔍 Risk Checker"])
+# Views. Only the selected view runs, so widgets in one never re-execute another
+VIEWS = ["📊 Dashboard", "💬 Beneficiary Chat", "🔍 Risk Checker"]
+view = st.radio("View", VIEWS, horizontal=True, label_visibility="collapsed", key="view")
+
+data_version = get_data_version()
+stats = get_stats(data_version)
 
 # ==================== TAB 1: DASHBOARD ====================
-with tab1:
-    df = load_data()
-    stats = get_stats()
+if view == VIEWS[0]:
     
     # Top metrics
     st.subheader("📈 Overview Metrics")
@@ -217,7 +268,11 @@ with tab1:
     
     with col1:
         st.subheader("🎯 Risk Distribution")
-        risk_counts = df['risk_category'].value_counts()
+        risk_counts = pd.Series({
+            'High': stats['high_risk_count'],
+            'Medium': stats['medium_risk_count'],
+            'Low': stats['low_risk_count']
+        })
         fig_pie = px.pie(
             values=risk_counts.values,
             names=risk_counts.index,
@@ -230,23 +285,80 @@ with tab1:
     
     with col2:
         st.subheader("📍 Risk by Region")
-        region_risk = df.groupby('region')['risk_score'].mean().sort_values(ascending=False)
-        fig_region = px.bar(
-            x=region_risk.values,
-            y=region_risk.index,
+        geo = get_geo(data_version)
+        state_risk = pd.DataFrame(geo['children'])
+        india_geojson = load_india_geojson()
+        if india_geojson is not None:
+            state_risk['geo_name'] = state_risk['state'].replace(GEOJSON_STATE_NAMES)
+            fig_region = px.choropleth(
+                state_risk,
+                geojson=india_geojson,
+                featureidkey='properties.ST_NM',
+                locations='geo_name',
+                color='avg_risk_score',
+                color_continuous_scale='RdYlGn_r',
+                hover_name='state',
+                hover_data={'geo_name': False, 'count': True, 'high_risk_rate': True, 'coverage_rate': True},
+                labels={'avg_risk_score': 'Average Risk Score'}
+            )
+            fig_region.update_geos(fitbounds='locations', visible=False)
+        else:
+            # Boundaries unavailable (e.g. offline): fall back to a ranked bar chart
+            state_risk = state_risk.sort_values('avg_risk_score', ascending=False)
+            fig_region = px.bar(
+                x=state_risk['avg_risk_score'],
+                y=state_risk['state'],
+                orientation='h',
+                color=state_risk['avg_risk_score'],
+                color_continuous_scale='RdYlGn_r',
+                labels={'x': 'Average Risk Score', 'y': 'Region'}
+            )
+        st.plotly_chart(fig_region, use_container_width=True)
+
+    # State -> district drill-down
+    st.subheader("🗺️ State & District Drill-down")
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        drill_state = st.selectbox("State", sorted(state_risk['state']), key="drill_state")
+        state_geo = get_geo(data_version, drill_state)
+        st.metric("Beneficiaries", f"{state_geo['summary']['count']:,}")
+        st.metric("High Risk Rate", f"{state_geo['summary']['high_risk_rate'] * 100:.1f}%")
+        st.metric("Coverage (checked in 30 days)", f"{state_geo['summary']['coverage_rate'] * 100:.1f}%")
+    with col2:
+        district_risk = pd.DataFrame(state_geo['children']).sort_values('avg_risk_score', ascending=False)
+        fig_district = px.bar(
+            district_risk,
+            x='avg_risk_score',
+            y='district',
             orientation='h',
-            color=region_risk.values,
+            color='high_risk_rate',
             color_continuous_scale='RdYlGn_r',
-            labels={'x': 'Average Risk Score', 'y': 'Region'}
+            hover_data=['count', 'coverage_rate'],
+            labels={'avg_risk_score': 'Average Risk Score', 'district': 'District', 'high_risk_rate': 'High Risk Rate'}
         )
-        st.plotly_chart(fig_region, use_container_width=True)
-    
+        st.plotly_chart(fig_district, use_container_width=True)
+
+    drill_district = st.selectbox("District", district_risk['district'].tolist(), key="drill_district")
+    district_geo = get_geo(data_version, drill_state, drill_district)
+    st.dataframe(
+        pd.DataFrame(district_geo['beneficiaries'])[
+            ['beneficiary_id', 'name', 'age_group', 'gender', 'risk_score', 'risk_category', 'days_since_last_check']
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
     # High risk alerts
     st.subheader("⚠️ High Risk Beneficiaries - Immediate Action Required")
-    high_risk_df = df[df['risk_category'] == 'High'].sort_values('risk_score', ascending=False).head(10)
+    high_risk, high_risk_total = get_beneficiaries_page(data_version, 'High', 0)
     
-    if len(high_risk_df) > 0:
-        for idx, row in high_risk_df.iterrows():
+    if high_risk_total > 0:
+        pages = (high_risk_total + PAGE_SIZE - 1) // PAGE_SIZE
+        page = st.number_input(f"Page (of {pages}, {high_risk_total:,} beneficiaries)",
+                               min_value=1, max_value=pages, value=1, key="high_risk_page")
+        if page > 1:
+            high_risk, _ = get_beneficiaries_page(data_version, 'High', page - 1)
+        for row in high_risk:
             with st.expander(f"🚨 {row['name']} - Risk Score: {row['risk_score']}/100 ({row['region']})"):
                 col1, col2, col3 = st.columns(3)
                 with col1:
@@ -263,9 +375,7 @@ with tab1:
     
     # Trend analysis
     st.subheader("📈 Risk Trends Over Time")
-    df['last_updated'] = pd.to_datetime(df['last_updated'])
-    daily_risk = df.groupby(df['last_updated'].dt.date)['risk_score'].mean().reset_index()
-    daily_risk.columns = ['date', 'avg_risk']
+    daily_risk = get_trend(data_version)
     
     fig_trend = px.line(
         daily_risk,
@@ -279,7 +389,7 @@ with tab1:
     
     # Age group analysis
     st.subheader("👶 Risk by Age Group")
-    age_risk = df.groupby(['age_group', 'risk_category']).size().unstack(fill_value=0)
+    age_risk = pd.DataFrame(stats['risk_by_age']).T.fillna(0).astype(int)
     fig_age = px.bar(
         age_risk,
         barmode='stack',
@@ -288,7 +398,7 @@ with tab1:
     st.plotly_chart(fig_age, use_container_width=True)
 
 # ==================== TAB 2: CHATBOT ====================
-with tab2:
+elif view == VIEWS[1]:
     st.subheader("💬 Beneficiary Meal Chat Interface")
     st.markdown("*Simple interface for beneficiaries to log meals and get instant risk assessment*")
     st.markdown("**Supports 13 languages with voice input!**")
@@ -306,6 +416,8 @@ with tab2:
 
     with col_info:
         st.info(f"📢 Selected: {selected_lang_display} | Voice input enabled")
+        beneficiary_id = st.text_input("Beneficiary ID (optional, tracks the whole day's meals)",
+                                       key="chat_beneficiary_id")
     
     # Chat interface
     if 'messages' not in st.session_state:
@@ -361,9 +473,12 @@ with tab2:
         # Get response from API
         with st.spinner("Processing..."):
             try:
-                response = requests.post(
-                    f"{API_URL}/chat",
-                    json={"user_message": user_input, "language": selected_lang}
+                response = api.post(
+                    "/chat",
+                    json={"user_message": user_input, "language": selected_lang,
+                          "beneficiary_id": beneficiary_id.strip() or None},
+                    # A retried message would be counted twice in the daily session
+                    idempotent=not beneficiary_id.strip()
                 )
 
                 if response.status_code == 200:
@@ -375,6 +490,12 @@ with tab2:
                     if data['food_groups']:
                         reply += f"**Food groups:** {', '.join(data['food_groups'])}\n\n"
                     reply += f"**Diversity score:** {data['diversity_score']}/7\n\n"
+                    if data.get('daily_summary'):
+                        daily = data['daily_summary']
+                        reply += (f"**Today so far:** {daily['diversity_score']}/7 food groups, "
+                                  f"~{daily['protein_g']} g protein, ~{daily['calories_kcal']} kcal\n\n")
+                    elif data.get('session_warning'):
+                        reply += f"⚠️ {data['session_warning']}\n\n"
                     reply += f"💡 **{data.get('suggestion', 'Keep up the good work!')}**"
 
                     st.session_state.messages.append({"role": "assistant", "content": reply})
@@ -386,7 +507,7 @@ with tab2:
         st.rerun()
 
 # ==================== TAB 3: RISK CHECKER ====================
-with tab3:
+else:
     st.subheader("🔍 Individual Risk Assessment Tool")
     st.markdown("*Enter beneficiary details to predict nourishment risk*")
     st.markdown("**Supports 13 languages with voice input!**")
@@ -413,7 +534,7 @@ with tab3:
         with col1:
             age_group = st.selectbox("Age Group", ['0-2 years', '3-5 years', '6-12 years', '13-18 years'])
             gender = st.selectbox("Gender", ['Male', 'Female'])
-            region = st.selectbox("Region", sorted(df['region'].unique().tolist()))
+            region = st.selectbox("Region", sorted(stats['regions']))
             meals = st.slider("Meals per Day", 1, 4, 3)
 
         with col2:
@@ -450,7 +571,7 @@ with tab3:
 
         with st.spinner("Analyzing..."):
             try:
-                response = requests.post(f"{API_URL}/predict", json=input_data)
+                response = api.post("/predict", json=input_data, idempotent=True)
 
                 if response.status_code == 200:
                     result = response.json()
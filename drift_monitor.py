@@ -0,0 +1,196 @@
+import bisect
+import json
+import threading
+
+import numpy as np
+
+# RiskInput fields compared against the training data
+NUMERIC_FIELDS = ['meals_per_day', 'food_diversity_score', 'protein_intake_g',
+                  'calorie_intake_kcal', 'attendance_rate', 'days_since_last_check']
+CATEGORICAL_FIELDS = ['age_group', 'gender', 'region']
+
+BASELINE_FILE = 'drift_baseline.json'
+BASELINE_BINS = 20
+# Distinct live values tracked per categorical field; the rest are counted together
+MAX_CATEGORIES = 64
+OTHER = '__other__'
+# Conventional PSI bands: below 0.1 stable, 0.1-0.25 moderate shift, above significant
+PSI_THRESHOLDS = (0.1, 0.25)
+# Floor for empty bins so PSI stays finite
+_EPSILON = 1e-4
+
+
+def build_baseline(frame, bins=BASELINE_BINS):
+    """Training-data histograms over quantile bin edges, plus category shares"""
+    baseline = {'rows': len(frame), 'numeric': {}, 'categorical': {}}
+    for field in NUMERIC_FIELDS:
+        values = frame[field].to_numpy(dtype=np.float64)
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, values, side='right'), minlength=len(edges) + 1)
+        baseline['numeric'][field] = {
+            'edges': edges.tolist(),
+            'proportions': (counts / counts.sum()).tolist(),
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'mean': float(values.mean()),
+        }
+    for field in CATEGORICAL_FIELDS:
+        shares = frame[field].astype(str).value_counts(normalize=True)
+        baseline['categorical'][field] = {str(k): float(v) for k, v in shares.items()}
+    return baseline
+
+
+def save_baseline(baseline, path=BASELINE_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False)
+
+
+def load_baseline(path=BASELINE_FILE):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def psi(expected, actual):
+    """Population stability index between two proportion vectors"""
+    expected = np.maximum(np.asarray(expected, dtype=np.float64), _EPSILON)
+    actual = np.maximum(np.asarray(actual, dtype=np.float64), _EPSILON)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def _status(value):
+    if value < PSI_THRESHOLDS[0]:
+        return 'stable'
+    return 'moderate' if value < PSI_THRESHOLDS[1] else 'significant'
+
+
+def _quantile(counts, edges, low, high, q):
+    """Approximate quantile from bin counts, interpolating linearly inside the bin"""
+    cdf = np.cumsum(counts) / counts.sum()
+    b = int(np.searchsorted(cdf, q))
+    bounds = [low] + list(edges) + [high]
+    start = cdf[b - 1] if b else 0.0
+    fraction = (q - start) / (cdf[b] - start) if cdf[b] > start else 0.0
+    return bounds[b] + (bounds[b + 1] - bounds[b]) * fraction
+
+
+class DriftMonitor:
+    """Constant-memory comparison of live inputs with the training baseline.
+
+    Each numeric field is counted into the baseline's quantile bins, and each
+    categorical field into at most MAX_CATEGORIES value counters. Counts are
+    kept for two tumbling windows of ``window`` rows; reports cover the
+    previous and current windows, so they follow recent traffic without
+    storing individual requests.
+    """
+
+    def __init__(self, baseline, window=10000, min_rows=200):
+        self.baseline = baseline
+        self.window = window
+        self.min_rows = min_rows
+        self._edges = {field: spec['edges'] for field, spec in baseline['numeric'].items()}
+        self._lock = threading.Lock()
+        self._previous = self._empty()
+        self._current = self._empty()
+        self.total_rows = 0
+
+    def _empty(self):
+        return {
+            'rows': 0,
+            'numeric': {field: [0] * (len(edges) + 1) for field, edges in self._edges.items()},
+            'sums': {field: 0.0 for field in self._edges},
+            'categorical': {field: {} for field in CATEGORICAL_FIELDS},
+        }
+
+    def _rotate(self):
+        if self._current['rows'] >= self.window:
+            self._previous, self._current = self._current, self._empty()
+
+    def record(self, values):
+        """Count one input (a dict with the RiskInput fields)"""
+        with self._lock:
+            sketch = self._current
+            for field, edges in self._edges.items():
+                value = values[field]
+                sketch['numeric'][field][bisect.bisect_right(edges, value)] += 1
+                sketch['sums'][field] += value
+            for field in CATEGORICAL_FIELDS:
+                counts = sketch['categorical'][field]
+                key = values[field]
+                if key not in counts and len(counts) >= MAX_CATEGORIES:
+                    key = OTHER
+                counts[key] = counts.get(key, 0) + 1
+            sketch['rows'] += 1
+            self.total_rows += 1
+            self._rotate()
+
+    def record_frame(self, frame):
+        """Count a batch of inputs (a DataFrame with the RiskInput columns)"""
+        bins = {field: np.bincount(np.searchsorted(edges, frame[field].to_numpy(dtype=np.float64), side='right'),
+                                   minlength=len(edges) + 1)
+                for field, edges in self._edges.items()}
+        values = {field: frame[field].astype(str).value_counts() for field in CATEGORICAL_FIELDS}
+        with self._lock:
+            sketch = self._current
+            for field, counts in bins.items():
+                sketch['numeric'][field] = [a + int(b) for a, b in zip(sketch['numeric'][field], counts)]
+                sketch['sums'][field] += float(frame[field].sum())
+            for field, value_counts in values.items():
+                counts = sketch['categorical'][field]
+                for key, n in value_counts.items():
+                    if key not in counts and len(counts) >= MAX_CATEGORIES:
+                        key = OTHER
+                    counts[key] = counts.get(key, 0) + int(n)
+            sketch['rows'] += len(frame)
+            self.total_rows += len(frame)
+            self._rotate()
+
+    def report(self):
+        """PSI and KS-style drift scores per field over the last one to two windows"""
+        with self._lock:
+            windows = [self._previous, self._current]
+            rows = sum(w['rows'] for w in windows)
+            numeric = {field: np.sum([w['numeric'][field] for w in windows], axis=0) for field in self._edges}
+            sums = {field: sum(w['sums'][field] for w in windows) for field in self._edges}
+            categorical = {}
+            for field in CATEGORICAL_FIELDS:
+                merged = {}
+                for w in windows:
+                    for key, n in w['categorical'][field].items():
+                        merged[key] = merged.get(key, 0) + n
+                categorical[field] = merged
+
+        report = {'rows': rows, 'total_rows': self.total_rows, 'window': self.window, 'features': {}}
+        if rows < self.min_rows:
+            report['status'] = 'insufficient_data'
+            return report
+
+        for field, counts in numeric.items():
+            spec = self.baseline['numeric'][field]
+            live = counts / rows
+            value = psi(spec['proportions'], live)
+            report['features'][field] = {
+                'psi': round(value, 4),
+                # Largest CDF gap at the bin edges: a lower bound on the KS statistic
+                'ks': round(float(np.abs(np.cumsum(live) - np.cumsum(spec['proportions'])).max()), 4),
+                'status': _status(value),
+                'baseline_mean': round(spec['mean'], 3),
+                'live_mean': round(sums[field] / rows, 3),
+                'live_median': round(float(_quantile(counts, spec['edges'], spec['min'], spec['max'], 0.5)), 3),
+            }
+
+        for field, counts in categorical.items():
+            expected = self.baseline['categorical'][field]
+            unseen = {key: n for key, n in counts.items() if key not in expected}
+            categories = list(expected) + [OTHER]
+            actual = [counts.get(key, 0) / rows for key in expected] + [sum(unseen.values()) / rows]
+            value = psi([expected[key] for key in expected] + [0.0], actual)
+            report['features'][field] = {
+                'psi': round(value, 4),
+                'status': _status(value),
+                'unseen': dict(sorted(unseen.items(), key=lambda x: -x[1])[:10]),
+                'largest_shift': max(categories[:-1], key=lambda k: abs(counts.get(k, 0) / rows - expected[k])),
+            }
+
+        worst = max(f['psi'] for f in report['features'].values())
+        report['status'] = _status(worst)
+        return report
@@ -0,0 +1,236 @@
+"""Offline risk scoring for field devices.
+
+Loads the single artifact written by ``export_edge.py`` and scores
+beneficiaries with numpy only: no scikit-learn, no pandas and no network.
+Results can be queued on disk and synced once connectivity returns.
+
+Usage:
+    python edge_scorer.py --artifact nourishai_edge.npz --benchmark
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import numpy as np
+
+# Profile fields every assessment needs; days_since_last_check defaults to 0
+REQUIRED_FIELDS = ['age_group', 'gender', 'region', 'meals_per_day', 'food_diversity_score',
+                   'protein_intake_g', 'calorie_intake_kcal', 'attendance_rate']
+
+
+class CompactEnsemble:
+    """One packed tree ensemble; ``leaf_values`` looks up every tree's leaf for each row.
+
+    Each ensemble is stored as three small per-node arrays plus two lookup tables:
+
+    - ``feature`` (int8): split feature, -1 for leaves
+    - ``right`` (int16): right child; the left child is always the next node,
+      because scikit-learn builds trees depth-first
+    - ``payload`` (uint16): index into ``thresholds`` for splits, into ``values``
+      for leaves
+    - ``thresholds`` (float32) and ``values`` (float32): deduplicated tables
+
+    That is 5 bytes per node against scikit-learn's 64-byte node struct plus a
+    float64 value array, so a whole forest stays resident in cache while scoring.
+    """
+
+    def __init__(self, arrays, prefix, max_depth):
+        feature = arrays[f'{prefix}_feature']
+        n_trees, max_nodes = feature.shape
+        # Flat views with right children as absolute positions, so traversal
+        # is a run of 1-D takes instead of 2-D fancy indexing
+        self.feature = feature.ravel()
+        self.payload = arrays[f'{prefix}_payload'].ravel()
+        self.right = (arrays[f'{prefix}_right'].astype(np.int32)
+                      + np.arange(n_trees, dtype=np.int32)[:, None] * max_nodes).ravel()
+        self.thresholds = arrays[f'{prefix}_thresholds']
+        self.values = arrays[f'{prefix}_values']
+        self.max_depth = max_depth
+        self.roots = np.arange(n_trees, dtype=np.int32) * max_nodes
+
+    def leaf_values(self, X):
+        """(rows, trees, outputs) leaf values for a float32 feature matrix"""
+        n_rows, n_features = X.shape
+        X = X.ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.int32) * n_features)[:, None]
+        node = np.tile(self.roots, (n_rows, 1))
+        for _ in range(self.max_depth):
+            f = self.feature.take(node)
+            # Leaves hold a value index in payload; clip keeps the lookup in bounds
+            threshold = self.thresholds.take(self.payload.take(node), mode='clip')
+            go_left = X.take(row_offsets + np.maximum(f, 0)) <= threshold
+            nxt = np.where(go_left, node + 1, self.right.take(node))
+            node = np.where(f < 0, node, nxt)
+        return self.values[self.payload.take(node)]
+
+
+class EdgeScorer:
+    """Scores RiskInput-style profiles from a packed model artifact"""
+
+    def __init__(self, path='nourishai_edge.npz'):
+        with np.load(path, allow_pickle=False) as artifact:
+            arrays = {name: artifact[name] for name in artifact.files if name != 'meta'}
+            self.meta = json.loads(str(artifact['meta']))
+        if 'gb_payload' not in arrays:
+            raise ValueError(f"{path} uses the old uncompacted layout; re-run export_edge.py")
+        self.gb = CompactEnsemble(arrays, 'gb', int(self.meta['gb_max_depth']))
+        self.rf = CompactEnsemble(arrays, 'rf', int(self.meta['rf_max_depth']))
+        self.model_version = self.meta['model_version']
+        self.classes = self.meta['classes']
+        self.encoders = {name: {label: i for i, label in enumerate(labels)}
+                         for name, labels in self.meta['encoders'].items()}
+
+    def encode(self, profile):
+        """Feature row for a profile dict (same fields as the API's RiskInput)"""
+        missing = [field for field in REQUIRED_FIELDS if profile.get(field) is None]
+        if missing:
+            raise ValueError(f"Missing fields: {', '.join(missing)}")
+        try:
+            age_encoded = self.encoders['age_group'][profile['age_group']]
+            region_encoded = self.encoders['region'][profile['region']]
+            gender_encoded = self.encoders['gender'][profile['gender']]
+        except KeyError as e:
+            raise ValueError(f"Unknown label: {e.args[0]}")
+        return [
+            self.meta['age_months_map'].get(profile['age_group'], 60),
+            profile['meals_per_day'],
+            profile['food_diversity_score'],
+            profile['protein_intake_g'],
+            profile['calorie_intake_kcal'],
+            profile['attendance_rate'],
+            profile.get('days_since_last_check', 0),
+            age_encoded,
+            region_encoded,
+            gender_encoded,
+        ]
+
+    def score(self, X):
+        """Risk scores and class probabilities for a feature matrix"""
+        # Trees compare float32 features against their thresholds, like scikit-learn
+        X = np.asarray(X, dtype=np.float32)
+        scores = float(self.meta['gb_base']) + self.gb.leaf_values(X)[:, :, 0].sum(axis=1, dtype=np.float64)
+        proba = self.rf.leaf_values(X).mean(axis=1, dtype=np.float64)
+        return scores, proba
+
+    def recommendations(self, risk_score, profile, language='en'):
+        """Rule-based recommendations from the artifact, translated offline"""
+        rules = self.meta['rules']
+        values = SimpleNamespace(**profile)
+        recs = [message for field, threshold, message in rules['input']
+                if getattr(values, field) < threshold]
+        for threshold, messages in rules['score']:
+            if risk_score > threshold:
+                recs.extend(messages)
+                break
+        if not recs:
+            recs.append(rules['default'])
+        table = self.meta['translations'].get(language, {})
+        return [table.get(rec, rec) for rec in recs]
+
+    def predict_many(self, profiles):
+        if not profiles:
+            return []
+        X = [self.encode(profile) for profile in profiles]
+        scores, proba = self.score(X)
+        timestamp = datetime.now().isoformat()
+        results = []
+        for profile, risk_score, row in zip(profiles, scores, proba):
+            results.append({
+                'risk_score': round(float(risk_score), 1),
+                'risk_category': self.classes[int(row.argmax())],
+                'confidence': round(float(row.max()) * 100, 1),
+                'recommendations': self.recommendations(risk_score, profile, profile.get('language', 'en')),
+                'timestamp': timestamp,
+                'model_version': self.model_version,
+            })
+        return results
+
+    def predict(self, profile):
+        return self.predict_many([profile])[0]
+
+
+class OfflineQueue:
+    """Append-only JSONL queue of assessments waiting to be synced"""
+
+    def __init__(self, path='edge_queue.jsonl'):
+        self.path = path
+
+    def append(self, record):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def pending(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def flush(self, send, batch_size=100):
+        """Send queued records in batches; ``send(batch)`` returns True on success.
+
+        Stops at the first failed batch and keeps it, and everything after it,
+        for the next attempt. Returns the number of records sent.
+        """
+        records = self.pending()
+        sent = 0
+        while sent < len(records):
+            batch = records[sent:sent + batch_size]
+            try:
+                ok = send(batch)
+            except OSError:
+                ok = False
+            if not ok:
+                break
+            sent += len(batch)
+
+        remaining = records[sent:]
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in remaining:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
+        return sent
+
+
+def benchmark(path, repeats):
+    started = time.perf_counter()
+    scorer = EdgeScorer(path)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    profile = {
+        'age_group': '3-5 years', 'gender': 'Female', 'region': 'Maharashtra',
+        'meals_per_day': 2, 'food_diversity_score': 3, 'protein_intake_g': 25.0,
+        'calorie_intake_kcal': 1200.0, 'attendance_rate': 0.75,
+        'days_since_last_check': 15, 'language': 'hi',
+    }
+    scorer.predict(profile)
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        scorer.predict(profile)
+        samples.append((time.perf_counter() - started) * 1000)
+
+    print(f"Artifact size:  {os.path.getsize(path) / 1024:.0f} KB")
+    print(f"Load time:      {load_ms:.1f} ms")
+    print(f"Prediction:     {np.median(samples):.3f} ms median, {np.percentile(samples, 99):.3f} ms p99")
+    print(f"Sample result:  {scorer.predict(profile)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline NourishAI risk scoring")
+    parser.add_argument('--artifact', default='nourishai_edge.npz')
+    parser.add_argument('--benchmark', action='store_true')
+    parser.add_argument('--repeats', type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.artifact, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import numpy as np
+
+from features import FEATURE_COLUMNS
+from recommendations import EXPLAIN_RULES, INPUT_RULES
+
+# Features a coordinator can act on, and the advice for each when it raises risk
+ACTIONABLE_FEATURES = {field: message for field, _, message in INPUT_RULES}
+ACTIONABLE_FEATURES.update(EXPLAIN_RULES)
+
+
+class TreePathExplainer:
+    """Per-feature contributions for a fitted GradientBoostingRegressor.
+
+    Walks every stored tree once at construction and records, for each leaf,
+    how much each split feature moved the node value along the path from the
+    root (path attribution). Explaining a row is then one leaf lookup and one
+    table gather per tree, and the contributions plus the base value add up
+    exactly to the model's prediction.
+    """
+
+    def __init__(self, model, feature_names=FEATURE_COLUMNS):
+        self.model = model
+        self.feature_names = list(feature_names)
+        trees = [est.tree_ for est in model.estimators_[:, 0]]
+        self.trees = trees
+        self.tree_index = np.arange(len(trees))
+        n_features = len(self.feature_names)
+        max_nodes = max(tree.node_count for tree in trees)
+
+        self.table = np.zeros((len(trees), max_nodes, n_features))
+        root_total = 0.0
+        for t, tree in enumerate(trees):
+            values = tree.value[:, 0, 0]
+            root_total += values[0]
+            stack = [(0, np.zeros(n_features))]
+            while stack:
+                node, path = stack.pop()
+                left, right = tree.children_left[node], tree.children_right[node]
+                if left == -1:
+                    self.table[t, node] = path
+                    continue
+                feature = tree.feature[node]
+                for child in (left, right):
+                    child_path = path.copy()
+                    child_path[feature] += values[child] - values[node]
+                    stack.append((child, child_path))
+
+        self.table *= model.learning_rate
+        self.base_value = self._init_value() + model.learning_rate * root_total
+
+    def _init_value(self):
+        init = self.model.init_
+        if isinstance(init, str):  # init='zero'
+            return 0.0
+        return float(np.ravel(init.predict(np.zeros((1, len(self.feature_names)))))[0])
+
+    def contributions(self, features):
+        """Contribution matrix (rows x features) for a feature matrix"""
+        # Trees split on float32 thresholds; calling them directly skips the
+        # per-call input validation of model.apply(), which dominates for one row
+        X = np.ascontiguousarray(features, dtype=np.float32)
+        leaves = np.column_stack([tree.apply(X) for tree in self.trees]).astype(np.intp)
+        return self.table[self.tree_index, leaves].sum(axis=1)
+
+    def explain(self, features):
+        """Explanation dicts for each row of a feature matrix"""
+        explanations = []
+        for row in self.contributions(features):
+            contributions = {name: round(float(v), 2) for name, v in zip(self.feature_names, row)}
+            explanations.append({
+                'base_value': round(float(self.base_value), 2),
+                'contributions': contributions,
+                'top_risk_factors': [name for name, v in sorted(contributions.items(), key=lambda x: -x[1])
+                                     if v > 0][:3],
+            })
+        return explanations
+
+
+def recommendations_from_explanation(explanation, min_points=2.0):
+    """Advice for the actionable features that add the most to the risk score"""
+    ranked = sorted(explanation['contributions'].items(), key=lambda x: -x[1])
+    return [ACTIONABLE_FEATURES[name] for name, points in ranked
+            if name in ACTIONABLE_FEATURES and points >= min_points]
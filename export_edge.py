@@ -0,0 +1,240 @@
+"""Export the trained models into a single artifact for offline scoring.
+
+Packs both tree ensembles into compact node arrays (see ``edge_scorer.py``),
+and adds the encoder labels, the recommendation rules and a translation table
+for every supported language. Thresholds are rounded down to float32, which
+leaves every split decision unchanged, and deduplicated. Leaf values are
+quantized (``--value-step`` for risk-score points, ``--proba-levels`` for
+forest class fractions) and deduplicated. The export prints the size, load
+time, latency and accuracy of the artifact next to the original models.
+The result is loaded by ``edge_scorer.py``, which needs neither
+scikit-learn nor a network connection.
+
+Usage:
+    python export_edge.py --output nourishai_edge.npz
+"""
+import argparse
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import accuracy_score, mean_absolute_error
+from sklearn.model_selection import train_test_split
+
+from edge_scorer import EdgeScorer
+from features import AGE_MONTHS_MAP, FEATURE_COLUMNS, encode_frame
+from model_store import MODEL_FILES, load_artifacts, model_version
+from recommendations import DEFAULT_RECOMMENDATION, INPUT_RULES, SCORE_RULES, api_messages
+from translation import SUPPORTED_LANGUAGES, TranslatorChain
+
+
+def float32_floor(values):
+    """Largest float32 not above each value, so ``x <= t`` is unchanged for float32 x"""
+    rounded = values.astype(np.float32)
+    too_high = rounded.astype(np.float64) > values
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+
+def _table(values, name):
+    """Deduplicate rows of ``values`` into a table and a uint16 index per row"""
+    table, index = np.unique(values, axis=0, return_inverse=True)
+    if len(table) > np.iinfo(np.uint16).max:
+        raise ValueError(f"{len(table)} distinct {name} do not fit a uint16 index; use coarser quantization")
+    return table, index.reshape(-1).astype(np.uint16)
+
+
+def pack_ensemble(trees, leaf_values, step=None):
+    """Pack sklearn ``tree_`` objects into compact node arrays (see edge_scorer.py).
+
+    ``leaf_values(tree)`` returns an (node_count, outputs) array; only leaf
+    rows are kept. ``step`` rounds leaf values to multiples of itself.
+    """
+    n_trees = len(trees)
+    max_nodes = max(tree.node_count for tree in trees)
+    if max_nodes > np.iinfo(np.int16).max:
+        raise ValueError(f"Trees with {max_nodes} nodes do not fit int16 child indices")
+
+    splits, leaves = [], []
+    for tree in trees:
+        is_leaf = tree.children_left == -1
+        internal = np.nonzero(~is_leaf)[0]
+        if not (tree.children_left[internal] == internal + 1).all():
+            raise ValueError("Expected depth-first trees (left child = next node)")
+        splits.append(tree.threshold[~is_leaf])
+        leaves.append(leaf_values(tree)[is_leaf])
+
+    thresholds, threshold_index = _table(float32_floor(np.concatenate(splits)), 'thresholds')
+    values = np.concatenate(leaves)
+    if step:
+        values = np.round(values / step) * step
+    values, value_index = _table(values.astype(np.float32), 'leaf values')
+
+    feature = np.full((n_trees, max_nodes), -1, dtype=np.int8)
+    right = np.zeros((n_trees, max_nodes), dtype=np.int16)
+    payload = np.zeros((n_trees, max_nodes), dtype=np.uint16)
+    split_at = leaf_at = 0
+    for t, tree in enumerate(trees):
+        n = tree.node_count
+        is_leaf = tree.children_left == -1
+        n_splits, n_leaves = int((~is_leaf).sum()), int(is_leaf.sum())
+        feature[t, :n] = np.where(is_leaf, -1, tree.feature)
+        right[t, :n] = np.where(is_leaf, 0, tree.children_right)
+        payload[t, :n][~is_leaf] = threshold_index[split_at:split_at + n_splits]
+        payload[t, :n][is_leaf] = value_index[leaf_at:leaf_at + n_leaves]
+        split_at += n_splits
+        leaf_at += n_leaves
+
+    arrays = {'feature': feature, 'right': right, 'payload': payload,
+              'thresholds': thresholds, 'values': values}
+    return arrays, max(tree.max_depth for tree in trees)
+
+
+def build_translations(languages, translate):
+    """Translation table {language: {english: translated}} for every API message"""
+    messages = api_messages()
+    table = {}
+    for lang in languages:
+        if lang == 'en':
+            continue
+        table[lang] = dict(zip(messages, translate(messages, target_lang=lang, source_lang='en')))
+    return table
+
+
+def export(output, value_step, proba_levels):
+    artifacts = load_artifacts()
+    score_model = artifacts['score_model']
+    cat_model = artifacts['cat_model']
+
+    gb_trees = [est.tree_ for est in score_model.estimators_[:, 0]]
+    gb, gb_depth = pack_ensemble(gb_trees, lambda tree: tree.value[:, 0, :] * score_model.learning_rate,
+                                 value_step)
+    init = score_model.init_
+    gb_base = 0.0 if isinstance(init, str) else float(np.ravel(init.predict(np.zeros((1, len(FEATURE_COLUMNS)))))[0])
+
+    # Forest votes are the per-tree class fractions at the leaf
+    def class_fractions(tree):
+        counts = tree.value[:, 0, :]
+        return counts / counts.sum(axis=1, keepdims=True)
+
+    rf, rf_depth = pack_ensemble([est.tree_ for est in cat_model.estimators_], class_fractions,
+                                 1.0 / proba_levels if proba_levels else None)
+
+    translator = TranslatorChain.from_names()
+    print(f"Translating {len(api_messages())} messages into {len(SUPPORTED_LANGUAGES) - 1} languages...")
+    translations = build_translations(SUPPORTED_LANGUAGES, translator.translate_batch)
+    untranslated = [lang for lang, table in translations.items()
+                    if all(source == target for source, target in table.items())]
+    if untranslated:
+        print(f"[WARN] No translations for {', '.join(untranslated)}; English will be shown offline")
+
+    meta = {
+        'model_version': model_version(),
+        'feature_columns': FEATURE_COLUMNS,
+        'age_months_map': AGE_MONTHS_MAP,
+        'encoders': {
+            'age_group': artifacts['le_age'].classes_.tolist(),
+            'region': artifacts['le_region'].classes_.tolist(),
+            'gender': artifacts['le_gender'].classes_.tolist(),
+        },
+        'classes': cat_model.classes_.tolist(),
+        'gb_base': gb_base,
+        'gb_max_depth': int(gb_depth),
+        'rf_max_depth': int(rf_depth),
+        'value_step': value_step,
+        'proba_levels': proba_levels,
+        'rules': {'input': INPUT_RULES, 'score': SCORE_RULES, 'default': DEFAULT_RECOMMENDATION},
+        'languages': list(SUPPORTED_LANGUAGES),
+        'translations': translations,
+    }
+
+    arrays = {f'gb_{name}': array for name, array in gb.items()}
+    arrays.update({f'rf_{name}': array for name, array in rf.items()})
+    np.savez_compressed(output, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+    return artifacts, arrays
+
+
+def timed(fn, repeats=1):
+    """Median wall time of fn() in milliseconds"""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return float(np.median(samples))
+
+
+def report(output, artifacts, arrays, repeats):
+    """Size, load time, accuracy and latency of the artifact against the scikit-learn models"""
+    score_model, cat_model = artifacts['score_model'], artifacts['cat_model']
+    scorer = EdgeScorer(output)
+
+    print("\n[INFO] Size")
+    for prefix, name in (('gb', 'score_model'), ('rf', 'cat_model')):
+        original = os.path.getsize(MODEL_FILES[name])
+        packed = sum(array.nbytes for key, array in arrays.items() if key.startswith(prefix))
+        tables = {key.split('_', 1)[1]: len(array) for key, array in arrays.items()
+                  if key.startswith(prefix) and key.endswith(('thresholds', 'values'))}
+        print(f"   {MODEL_FILES[name]:<26} {original / 1024:>8.0f} KB -> {packed / 1024:>6.0f} KB "
+              f"({original / packed:.1f}x; {tables['thresholds']} thresholds, {tables['values']} leaf values)")
+    print(f"   {output:<26} {os.path.getsize(output) / 1024:>8.0f} KB on disk")
+
+    print("\n[INFO] Load time")
+    load_pkl = timed(lambda: (joblib.load(MODEL_FILES['score_model']), joblib.load(MODEL_FILES['cat_model'])), 5)
+    load_edge = timed(lambda: EdgeScorer(output), 5)
+    print(f"   joblib pickles {load_pkl:.1f} ms, edge artifact {load_edge:.1f} ms")
+
+    # Same split as train_model.py
+    roster = pd.read_csv('beneficiary_data.csv')
+    features, valid = encode_frame(roster, artifacts['le_age'], artifacts['le_region'], artifacts['le_gender'])
+    roster, features = roster[valid], features[valid]
+    _, X_test, _, y_score, _, y_cat = train_test_split(
+        features, roster['risk_score'], roster['risk_category'], test_size=0.2, random_state=42)
+    frame = pd.DataFrame(X_test, columns=FEATURE_COLUMNS)
+
+    original_scores = score_model.predict(frame)
+    original_proba = cat_model.predict_proba(frame)
+    edge_scores, edge_proba = scorer.score(X_test)
+    original_cat = cat_model.classes_[original_proba.argmax(axis=1)]
+    edge_cat = np.array(scorer.classes)[edge_proba.argmax(axis=1)]
+
+    print(f"\n[INFO] Accuracy on the {len(X_test):,}-row test split")
+    print(f"   Risk score MAE:     {mean_absolute_error(y_score, original_scores):.4f} -> "
+          f"{mean_absolute_error(y_score, edge_scores):.4f} "
+          f"(max score change {np.abs(original_scores - edge_scores).max():.4f})")
+    print(f"   Category accuracy:  {accuracy_score(y_cat, original_cat):.4f} -> "
+          f"{accuracy_score(y_cat, edge_cat):.4f} "
+          f"(agreement {np.mean(original_cat == edge_cat):.4f}, "
+          f"max probability change {np.abs(original_proba - edge_proba).max():.4f})")
+
+    print("\n[INFO] Latency (median)")
+    print(f"   {'rows':>6} {'sklearn ms':>11} {'edge ms':>11}")
+    for rows in (1, 1000):
+        batch, batch_frame = X_test[:rows], frame.iloc[:rows]
+        sklearn_ms = timed(lambda: (score_model.predict(batch_frame), cat_model.predict_proba(batch_frame)), repeats)
+        edge_ms = timed(lambda: scorer.score(batch), repeats)
+        print(f"   {len(batch):>6} {sklearn_ms:>11.3f} {edge_ms:>11.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export models for offline edge scoring")
+    parser.add_argument('--output', default='nourishai_edge.npz')
+    parser.add_argument('--value-step', type=float, default=0.001,
+                        help="Round risk-score leaf values to multiples of this (0 keeps float32)")
+    parser.add_argument('--proba-levels', type=int, default=255,
+                        help="Round forest class fractions to 1/N steps (0 keeps float32)")
+    parser.add_argument('--repeats', type=int, default=50)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    artifacts, arrays = export(args.output, args.value_step, args.proba_levels)
+    print(f"[OK] Edge artifact saved to: {args.output} "
+          f"({os.path.getsize(args.output) / 1024:.0f} KB, {time.perf_counter() - started:.1f}s)")
+    report(args.output, artifacts, arrays, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import io
+import zlib
+
+import numpy as np
+
+EXPORT_CHUNK_ROWS = 10_000
+
+MEDIA_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def _chunks(frame, filters, columns, chunk_rows):
+    """Yield filtered slices of ``frame`` without materializing the full extract.
+
+    Filters are ``column == value`` conditions (None values are ignored) and
+    are applied one slice at a time, so memory does not grow with the roster.
+    """
+    filters = {column: value for column, value in filters.items() if value is not None}
+    for start in range(0, len(frame), chunk_rows):
+        chunk = frame.iloc[start:start + chunk_rows]
+        if filters:
+            mask = np.ones(len(chunk), dtype=bool)
+            for column, value in filters.items():
+                mask &= (chunk[column] == value).to_numpy()
+            chunk = chunk[mask]
+        yield chunk[columns]
+
+
+def iter_csv(frame, filters, columns, chunk_rows=EXPORT_CHUNK_ROWS):
+    yield (','.join(columns) + '\n').encode('utf-8')
+    for chunk in _chunks(frame, filters, columns, chunk_rows):
+        yield chunk.to_csv(index=False, header=False).encode('utf-8')
+
+
+def iter_ndjson(frame, filters, columns, chunk_rows=EXPORT_CHUNK_ROWS):
+    for chunk in _chunks(frame, filters, columns, chunk_rows):
+        if len(chunk):
+            yield chunk.to_json(orient='records', lines=True, force_ascii=False).encode('utf-8')
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file object whose contents can be drained between row groups"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer.extend(data)
+        return len(data)
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def iter_parquet(frame, filters, columns, chunk_rows=EXPORT_CHUNK_ROWS, compression='snappy'):
+    """Stream a Parquet file, one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _DrainableSink()
+    writer = None
+    try:
+        for chunk in _chunks(frame, filters, columns, chunk_rows):
+            if not len(chunk):
+                continue
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                # Infer the schema from real rows; empty object columns carry no type
+                writer = pq.ParquetWriter(sink, table.schema, compression=compression)
+            writer.write_table(table.cast(writer.schema))
+            data = sink.drain()
+            if data:
+                yield data
+        if writer is None:
+            empty = pa.Table.from_pandas(frame.iloc[:0][columns], preserve_index=False)
+            writer = pq.ParquetWriter(sink, empty.schema, compression=compression)
+    finally:
+        if writer is not None:
+            writer.close()
+    yield sink.drain()
+
+
+def gzip_stream(chunks, level=6):
+    """Gzip-compress a stream of byte chunks incrementally"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
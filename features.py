@@ -0,0 +1,45 @@
+import numpy as np
+
+# Representative age in months for each age group, used when only the group is known
+AGE_MONTHS_MAP = {
+    '0-2 years': 12,
+    '3-5 years': 48,
+    '6-12 years': 108,
+    '13-18 years': 180
+}
+
+NUMERIC_FEATURES = ['age_months', 'meals_per_day', 'food_diversity_score',
+                    'protein_intake_g', 'calorie_intake_kcal', 'attendance_rate',
+                    'days_since_last_check']
+
+FEATURE_COLUMNS = NUMERIC_FEATURES + ['age_group_encoded', 'region_encoded', 'gender_encoded']
+
+
+def encode_labels(encoder, values):
+    """Vectorized LabelEncoder.transform that returns -1 for unseen labels"""
+    classes = encoder.classes_
+    values = np.asarray(values, dtype=classes.dtype if classes.dtype.kind == 'U' else object)
+    positions = np.searchsorted(classes, values)
+    positions = np.clip(positions, 0, len(classes) - 1)
+    return np.where(classes[positions] == values, positions, -1)
+
+
+def encode_frame(frame, le_age, le_region, le_gender):
+    """Build the model feature matrix for a roster DataFrame.
+
+    Returns the matrix and a boolean mask of rows whose categorical values
+    were all known to the encoders; other rows should not be scored.
+    """
+    codes = [
+        encode_labels(le_age, frame['age_group'].astype(str)),
+        encode_labels(le_region, frame['region'].astype(str)),
+        encode_labels(le_gender, frame['gender'].astype(str)),
+    ]
+    valid = np.all([c >= 0 for c in codes], axis=0)
+
+    matrix = np.empty((len(frame), len(FEATURE_COLUMNS)), dtype=np.float64)
+    for i, col in enumerate(NUMERIC_FEATURES):
+        matrix[:, i] = frame[col].to_numpy(dtype=np.float64)
+    for i, c in enumerate(codes):
+        matrix[:, len(NUMERIC_FEATURES) + i] = c
+    return matrix, valid
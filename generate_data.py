@@ -13,6 +13,12 @@ nfhs_df = pd.read_csv('NFHS-5-States.csv')
 # Extract Indian states from NFHS data
 indian_states = nfhs_df[nfhs_df['state'] != 'India']['state'].unique()
 
+# Districts per state from NFHS district data (states not covered get 'Unassigned')
+nfhs_districts = pd.read_csv('NFHS-5-Districts.csv', usecols=['State', 'District']).drop_duplicates()
+districts_by_state = {state: sorted(group['District']) for state, group in nfhs_districts.groupby('State')}
+# Separate generator so adding districts does not change the other generated values
+district_rng = np.random.RandomState(7)
+
 # Sample common Indian names
 first_names_male = ['Aarav', 'Vivaan', 'Aditya', 'Arjun', 'Sai', 'Arnav', 'Ayaan', 'Krishna', 'Ishaan', 'Shaurya',
                      'Atharva', 'Advaith', 'Pranav', 'Reyansh', 'Muhammad', 'Syed', 'Aryan', 'Ved', 'Kabir', 'Dhruv']
@@ -61,6 +67,8 @@ for i in range(n_beneficiaries):
         'Punjab', 'Chhattisgarh', 'Haryana', 'NCT Delhi', 'Jammu and Kashmir'
     ])
 
+    district = district_rng.choice(districts_by_state.get(region, ['Unassigned']))
+
     # Risk-based generation using NFHS patterns
     is_high_risk = np.random.random() < malnutrition_rates[age_group]
 
@@ -148,6 +156,7 @@ for i in range(n_beneficiaries):
         'age_months': age_months,
         'gender': gender,
         'region': region,
+        'district': district,
         'meals_per_day': meals_per_day,
         'food_diversity_score': food_diversity_score,
         'protein_intake_g': round(protein_intake_g, 1),
@@ -0,0 +1,179 @@
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+RISK_CATEGORIES = ['High', 'Medium', 'Low']
+SCORE_BIN_WIDTH = 0.5
+SCORE_BINS = int(100 / SCORE_BIN_WIDTH) + 1
+QUANTILES = [0.25, 0.5, 0.75, 0.9]
+# A beneficiary counts as covered if checked within this many days
+COVERAGE_WINDOW_DAYS = 30
+UNASSIGNED = 'Unassigned'
+
+# Layout of the per-node aggregate vector
+_COUNT, _COVERED, _SCORE_SUM = 0, 1, 2
+_CATEGORIES = 3
+_HISTOGRAM = _CATEGORIES + len(RISK_CATEGORIES)
+_WIDTH = _HISTOGRAM + SCORE_BINS
+
+
+def load_district_lists(path='NFHS-5-Districts.csv'):
+    """Districts per state from the NFHS-5 district file"""
+    districts = pd.read_csv(path, usecols=['State', 'District']).drop_duplicates()
+    return {state: sorted(group['District']) for state, group in districts.groupby('State')}
+
+
+def assign_districts(frame, districts_by_state):
+    """District of each beneficiary.
+
+    Uses the roster's ``district`` column when present. Older rosters have no
+    district, so beneficiaries are spread over their state's NFHS districts by
+    a stable hash of their ID; states missing from NFHS get ``Unassigned``.
+    """
+    if 'district' in frame.columns:
+        return frame['district'].astype(str).to_numpy(dtype=object)
+
+    result = np.full(len(frame), UNASSIGNED, dtype=object)
+    states = frame['region'].astype(str).to_numpy(dtype=object)
+    ids = frame['beneficiary_id'].astype(str).to_numpy(dtype=object)
+    for i, (state, beneficiary_id) in enumerate(zip(states, ids)):
+        districts = districts_by_state.get(state)
+        if districts:
+            result[i] = districts[zlib.crc32(beneficiary_id.encode('utf-8')) % len(districts)]
+    return result
+
+
+def _aggregate(frame, group_codes, n_groups):
+    """Aggregate vectors for every group in one vectorized pass"""
+    scores = frame['risk_score'].to_numpy(dtype=np.float64)
+    covered = frame['days_since_last_check'].to_numpy() <= COVERAGE_WINDOW_DAYS
+    categories = pd.Categorical(frame['risk_category'], categories=RISK_CATEGORIES).codes
+    bins = np.clip((scores / SCORE_BIN_WIDTH).astype(np.int64), 0, SCORE_BINS - 1)
+
+    vectors = np.zeros((n_groups, _WIDTH), dtype=np.float64)
+    vectors[:, _COUNT] = np.bincount(group_codes, minlength=n_groups)
+    vectors[:, _COVERED] = np.bincount(group_codes, weights=covered, minlength=n_groups)
+    vectors[:, _SCORE_SUM] = np.bincount(group_codes, weights=scores, minlength=n_groups)
+
+    known = categories >= 0
+    flat = group_codes[known] * len(RISK_CATEGORIES) + categories[known]
+    vectors[:, _CATEGORIES:_HISTOGRAM] = np.bincount(
+        flat, minlength=n_groups * len(RISK_CATEGORIES)).reshape(n_groups, -1)
+
+    flat = group_codes * SCORE_BINS + bins
+    vectors[:, _HISTOGRAM:] = np.bincount(flat, minlength=n_groups * SCORE_BINS).reshape(n_groups, -1)
+    return vectors
+
+
+def _summarize(vector):
+    count = int(vector[_COUNT])
+    summary = {
+        'count': count,
+        'risk_counts': {cat: int(vector[_CATEGORIES + i]) for i, cat in enumerate(RISK_CATEGORIES)},
+        'avg_risk_score': round(vector[_SCORE_SUM] / count, 1) if count else None,
+        'coverage_rate': round(vector[_COVERED] / count, 3) if count else None,
+        'risk_score_quantiles': {},
+    }
+    if count:
+        cumulative = np.cumsum(vector[_HISTOGRAM:])
+        for q in QUANTILES:
+            target = q * count
+            b = int(np.searchsorted(cumulative, target))
+            before = cumulative[b - 1] if b else 0.0
+            within = vector[_HISTOGRAM + b]
+            fraction = (target - before) / within if within else 0.0
+            value = (b + fraction) * SCORE_BIN_WIDTH
+            summary['risk_score_quantiles'][f'p{int(q * 100)}'] = round(min(value, 100.0), 1)
+    summary['high_risk_rate'] = round(summary['risk_counts']['High'] / count, 3) if count else None
+    return summary
+
+
+class GeoCube:
+    """State -> district -> beneficiary roll-up of risk aggregates.
+
+    Each district keeps an aggregate vector (counts per category, coverage,
+    score sum and a risk-score histogram for quantiles). State and national
+    vectors are maintained alongside, so add/remove only touch the affected
+    nodes and drill-down queries never rescan the roster.
+    """
+
+    def __init__(self, districts_by_state=None):
+        self.districts_by_state = districts_by_state or {}
+        self._total = np.zeros(_WIDTH)
+        self._states = {}
+        self._districts = {}
+        self._members = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, frame, districts_by_state=None):
+        cube = cls(districts_by_state)
+        cube.add_rows(frame, np.arange(len(frame)))
+        return cube
+
+    def _apply(self, frame, positions, sign):
+        if not len(frame):
+            return
+        states = frame['region'].astype(str).to_numpy(dtype=object)
+        districts = assign_districts(frame, self.districts_by_state)
+        keys = pd.MultiIndex.from_arrays([states, districts])
+        group_codes, uniques = pd.factorize(keys)
+        vectors = _aggregate(frame, group_codes, len(uniques))
+
+        order = np.argsort(group_codes, kind='stable')
+        boundaries = np.flatnonzero(np.diff(group_codes[order])) + 1
+        grouped_positions = np.split(np.asarray(positions)[order], boundaries)
+
+        with self._lock:
+            for (state, district), vector, members in zip(uniques, vectors, grouped_positions):
+                key = (state, district)
+                self._total += sign * vector
+                self._states[state] = self._states.get(state, np.zeros(_WIDTH)) + sign * vector
+                self._districts[key] = self._districts.get(key, np.zeros(_WIDTH)) + sign * vector
+                current = self._members.get(key, set())
+                if sign > 0:
+                    current.update(members.tolist())
+                else:
+                    current.difference_update(members.tolist())
+                self._members[key] = current
+
+                if self._districts[key][_COUNT] <= 0:
+                    del self._districts[key]
+                    del self._members[key]
+                if self._states[state][_COUNT] <= 0:
+                    del self._states[state]
+
+    def add_rows(self, frame, positions):
+        """Add roster rows (with their row positions in the roster) to the cube"""
+        self._apply(frame, positions, 1)
+
+    def remove_rows(self, frame, positions):
+        """Remove previously added roster rows, e.g. before re-adding updated values"""
+        self._apply(frame, positions, -1)
+
+    def country(self):
+        with self._lock:
+            return {
+                'summary': _summarize(self._total),
+                'children': [dict(state=s, **_summarize(v)) for s, v in sorted(self._states.items())],
+            }
+
+    def state(self, state):
+        with self._lock:
+            if state not in self._states:
+                return None
+            return {
+                'summary': _summarize(self._states[state]),
+                'children': [dict(district=d, **_summarize(v))
+                             for (s, d), v in sorted(self._districts.items()) if s == state],
+            }
+
+    def district(self, state, district):
+        """District summary and the row positions of its beneficiaries"""
+        with self._lock:
+            key = (state, district)
+            if key not in self._districts:
+                return None
+            return _summarize(self._districts[key]), np.fromiter(self._members[key], dtype=np.int64)
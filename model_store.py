@@ -0,0 +1,52 @@
+import hashlib
+import json
+import os
+
+import joblib
+
+# Model artifacts produced by train_model.py
+MODEL_FILES = {
+    'score_model': 'risk_score_model.pkl',
+    'cat_model': 'risk_category_model.pkl',
+    'le_age': 'encoder_age.pkl',
+    'le_region': 'encoder_region.pkl',
+    'le_gender': 'encoder_gender.pkl',
+}
+
+# Training provenance for the artifacts above: version, data watermark, metrics
+MANIFEST_FILE = 'model_manifest.json'
+
+
+def model_version(files=MODEL_FILES):
+    """Short content hash identifying a set of model artifacts"""
+    digest = hashlib.sha256()
+    for path in files.values():
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def load_artifacts(files=MODEL_FILES):
+    """Load models and encoders into a dict keyed like MODEL_FILES"""
+    return {name: joblib.load(path) for name, path in files.items()}
+
+
+def save_artifacts(artifacts, directory='.'):
+    """Write models and encoders into ``directory``; returns their paths keyed like MODEL_FILES"""
+    os.makedirs(directory, exist_ok=True)
+    files = {name: os.path.join(directory, path) for name, path in MODEL_FILES.items()}
+    for name, path in files.items():
+        joblib.dump(artifacts[name], path)
+    return files
+
+
+def load_manifest(path=MANIFEST_FILE):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
@@ -0,0 +1,115 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Step sizes used to quantize the continuous /predict inputs before they are
+# used as a cache key. Requests falling in the same bucket share one result.
+QUANTIZATION = {
+    'protein_intake_g': 0.1,
+    'calorie_intake_kcal': 1.0,
+    'attendance_rate': 0.01,
+}
+
+
+def quantize(value, step):
+    return round(round(value / step) * step, 6)
+
+
+def _entry_size(key, value):
+    """Rough memory footprint of a cached entry in bytes"""
+    size = sys.getsizeof(key) + sum(sys.getsizeof(k) for k in key)
+    size += sys.getsizeof(value)
+    for item in value.values():
+        size += sys.getsizeof(item)
+        if isinstance(item, list):
+            size += sum(sys.getsizeof(x) for x in item)
+    return size
+
+
+class PredictionCache:
+    """Thread-safe LRU cache with TTL expiry and a memory budget.
+
+    Entries are evicted least-recently-used first once either ``max_bytes``
+    or ``max_entries`` is exceeded, and are treated as misses once older
+    than ``ttl`` seconds.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, max_entries=100_000, ttl=3600):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._miss_seconds = 0.0
+        self._hit_seconds = 0.0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, size, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._bytes -= size
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        size = _entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.invalidations += 1
+
+    def record(self, hit, seconds):
+        """Record the latency of a lookup that hit or missed"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self._hit_seconds += seconds
+            else:
+                self.misses += 1
+                self._miss_seconds += seconds
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            avg_miss_ms = self._miss_seconds / self.misses * 1000 if self.misses else 0.0
+            avg_hit_ms = self._hit_seconds / self.hits * 1000 if self.hits else 0.0
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'avg_hit_ms': round(avg_hit_ms, 3),
+                'avg_miss_ms': round(avg_miss_ms, 3),
+                'latency_saved_ms': round(max(avg_miss_ms - avg_hit_ms, 0.0) * self.hits, 1),
+            }
@@ -0,0 +1,61 @@
+# Recommendation rules, kept as data so they can be shipped to offline scorers
+
+# (field, threshold, message): added when the input field is below the threshold
+INPUT_RULES = [
+    ('meals_per_day', 3, "🍽️ Increase meal frequency to at least 3 times per day"),
+    ('food_diversity_score', 4, "🥗 Add more variety - include vegetables, fruits, and protein sources"),
+    ('protein_intake_g', 40, "🥚 Increase protein through dal, eggs, milk, or soy products"),
+    ('attendance_rate', 0.75, "📅 Improve program attendance for consistent nutrition"),
+]
+
+# (threshold, messages): the first band whose threshold the risk score exceeds applies
+SCORE_RULES = [
+    (60, ["⚠️ HIGH RISK - Schedule health checkup within 7 days",
+          "📞 Contact program coordinator immediately"]),
+    (40, ["⚡ Monitor closely - recheck within 14 days"]),
+]
+
+DEFAULT_RECOMMENDATION = "✅ Continue current nutrition plan"
+
+# Extra advice from explanations (explain.py), keyed by the feature driving the risk
+EXPLAIN_RULES = {
+    'calorie_intake_kcal': "🍚 Increase daily calorie intake with energy-dense foods",
+    'days_since_last_check': "🩺 Schedule a growth check - the last one was a while ago",
+}
+
+# Chat replies; {placeholders} are filled in for each message
+CHAT_DETECTED = "I detected {items} food items covering {groups} food groups."
+CHAT_TODAY = "Today so far: {groups} food groups from {messages} messages."
+CHAT_LOW_DIVERSITY = "Try to add more variety - include vegetables, fruits, or protein sources."
+CHAT_GOOD_DIVERSITY = "Good dietary diversity! Keep it up."
+CHAT_MESSAGES = [CHAT_DETECTED, CHAT_TODAY, CHAT_LOW_DIVERSITY, CHAT_GOOD_DIVERSITY]
+
+
+def all_messages():
+    """Every message the rules can produce, in English"""
+    messages = [message for _, _, message in INPUT_RULES]
+    for _, band in SCORE_RULES:
+        messages.extend(band)
+    messages.append(DEFAULT_RECOMMENDATION)
+    return messages
+
+
+def api_messages():
+    """Every English message or template the API can send, for translation tables"""
+    return all_messages() + list(EXPLAIN_RULES.values()) + CHAT_MESSAGES
+
+
+def generate_recommendations(risk_score, input_data):
+    """Generate personalized recommendations"""
+    recs = [message for field, threshold, message in INPUT_RULES
+            if getattr(input_data, field) < threshold]
+
+    for threshold, messages in SCORE_RULES:
+        if risk_score > threshold:
+            recs.extend(messages)
+            break
+
+    if not recs:
+        recs.append(DEFAULT_RECOMMENDATION)
+
+    return recs
@@ -0,0 +1,65 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def _codes_dtype(n_categories):
+    """Smallest integer dtype able to hold the dictionary codes"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def export_roster(df, directory):
+    """Write the roster as one .npy file per column so it can be memory-mapped.
+
+    Numeric columns are stored as-is. Text columns are dictionary-encoded into
+    integer codes plus a small categories file, so workers never hold per-row
+    Python string objects.
+    """
+    os.makedirs(directory, exist_ok=True)
+    columns = []
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series):
+            np.save(os.path.join(directory, f'{col}.npy'), series.to_numpy())
+            columns.append({'name': col, 'kind': 'numeric'})
+        else:
+            cat = pd.Categorical(series.astype(str))
+            codes = cat.codes.astype(_codes_dtype(len(cat.categories)))
+            np.save(os.path.join(directory, f'{col}.codes.npy'), codes)
+            np.save(os.path.join(directory, f'{col}.categories.npy'),
+                    np.asarray(cat.categories, dtype=str))
+            columns.append({'name': col, 'kind': 'dictionary'})
+
+    manifest = {'rows': len(df), 'columns': columns}
+    with open(os.path.join(directory, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f)
+    return manifest
+
+
+def load_roster(directory):
+    """Open an exported roster as a DataFrame backed by read-only memory maps.
+
+    The OS page cache holds a single copy of every column, shared by all
+    processes that load the same directory.
+    """
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+
+    data = {}
+    for column in manifest['columns']:
+        name = column['name']
+        if column['kind'] == 'numeric':
+            data[name] = np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+        else:
+            codes = np.load(os.path.join(directory, f'{name}.codes.npy'), mmap_mode='r')
+            categories = np.load(os.path.join(directory, f'{name}.categories.npy'))
+            data[name] = pd.Categorical.from_codes(codes, categories=categories.tolist())
+
+    return pd.DataFrame(data, copy=False)
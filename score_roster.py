@@ -0,0 +1,204 @@
+"""Re-score the beneficiary roster with the trained models.
+
+The roster is streamed in chunks and scored across a process pool using the
+vectorized feature path. Each finished chunk is written as its own part file
+and recorded in a checkpoint, so an interrupted run resumes where it stopped.
+
+Usage:
+    python score_roster.py --output-dir rescored --workers 8
+    python score_roster.py --output-dir rescored --merge beneficiary_data_rescored.csv
+"""
+import argparse
+import csv
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from features import FEATURE_COLUMNS, encode_frame
+from model_store import load_artifacts, model_version
+
+CHECKPOINT_FILE = 'checkpoint.json'
+
+# Per-process models, loaded once by the pool initializer
+_artifacts = None
+
+
+def init_worker():
+    global _artifacts
+    _artifacts = load_artifacts()
+
+
+def part_path(output_dir, index):
+    return os.path.join(output_dir, f'part-{index:05d}.csv')
+
+
+def score_chunk(index, chunk, output_dir, version):
+    """Score one chunk and write it as a part file. Returns (index, scored, skipped)"""
+    matrix, valid = encode_frame(chunk, _artifacts['le_age'], _artifacts['le_region'],
+                                 _artifacts['le_gender'])
+    chunk = chunk.copy()
+    chunk['risk_score'] = np.nan
+    chunk['risk_category'] = None
+    chunk['confidence'] = np.nan
+
+    if valid.any():
+        features = pd.DataFrame(matrix[valid], columns=FEATURE_COLUMNS)
+        cat_model = _artifacts['cat_model']
+        proba = cat_model.predict_proba(features)
+        chunk.loc[valid, 'risk_score'] = np.round(_artifacts['score_model'].predict(features), 1)
+        chunk.loc[valid, 'risk_category'] = cat_model.classes_[proba.argmax(axis=1)]
+        chunk.loc[valid, 'confidence'] = np.round(proba.max(axis=1) * 100, 1)
+    chunk['model_version'] = version
+
+    path = part_path(output_dir, index)
+    chunk.to_csv(path + '.tmp', index=False)
+    os.replace(path + '.tmp', path)
+    return index, int(valid.sum()), int((~valid).sum())
+
+
+def load_checkpoint(output_dir):
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_checkpoint(output_dir, checkpoint):
+    path = os.path.join(output_dir, CHECKPOINT_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(path + '.tmp', path)
+
+
+def read_chunks(f, chunksize, skip_rows=0):
+    """Chunks of an open roster CSV after its first ``skip_rows`` data rows.
+
+    Skipped rows are read past line by line without being parsed or indexed,
+    so resuming near the end of a large roster costs one pass over the file.
+    Roster rows hold no quoted newlines, so one line is one row.
+    """
+    header_columns = next(csv.reader([f.readline()]))
+    for _ in range(skip_rows):
+        f.readline()
+    # read_csv yields one empty chunk at end of file, which would be scored as a new chunk
+    position = f.tell()
+    if not f.readline():
+        return iter(())
+    f.seek(position)
+    return pd.read_csv(f, chunksize=chunksize, header=None, names=header_columns)
+
+
+def merge_parts(output_dir, checkpoint, destination):
+    """Concatenate the part files, in roster order, into one CSV"""
+    with open(destination, 'w', encoding='utf-8', newline='') as out:
+        for i, index in enumerate(sorted(checkpoint['completed'])):
+            with open(part_path(output_dir, index), encoding='utf-8') as part:
+                header = part.readline()
+                if i == 0:
+                    out.write(header)
+                shutil.copyfileobj(part, out)
+
+
+def run(input_path, output_dir, workers, chunksize, restart):
+    os.makedirs(output_dir, exist_ok=True)
+    version = model_version()
+
+    checkpoint = None if restart else load_checkpoint(output_dir)
+    if checkpoint is not None and (checkpoint['model_version'] != version
+                                   or checkpoint['input'] != os.path.abspath(input_path)
+                                   or checkpoint['chunksize'] != chunksize):
+        raise SystemExit("[ERROR] Checkpoint was written for different models, input or "
+                         "chunk size; rerun with --restart")
+    if checkpoint is None:
+        checkpoint = {
+            'model_version': version,
+            'input': os.path.abspath(input_path),
+            'chunksize': chunksize,
+            'completed': [],
+            'rows_scored': 0,
+            'rows_skipped': 0,
+            'finished': False,
+        }
+        save_checkpoint(output_dir, checkpoint)
+
+    completed = set(checkpoint['completed'])
+    if completed:
+        print(f"[INFO] Resuming: {len(completed)} chunks already scored")
+
+    # Chunks finished in order at the start of the file can be skipped without parsing
+    prefix = 0
+    while prefix in completed:
+        prefix += 1
+
+    started = time.perf_counter()
+    rows_this_run = 0
+    pending = set()
+
+    def collect(done):
+        nonlocal rows_this_run
+        for future in done:
+            index, scored, skipped = future.result()
+            completed.add(index)
+            checkpoint['completed'] = sorted(completed)
+            checkpoint['rows_scored'] += scored
+            checkpoint['rows_skipped'] += skipped
+            save_checkpoint(output_dir, checkpoint)
+            rows_this_run += scored + skipped
+            elapsed = time.perf_counter() - started
+            print(f"   chunk {index}: {scored:,} scored, {skipped:,} skipped "
+                  f"({rows_this_run / elapsed:,.0f} rows/sec)", flush=True)
+
+    with open(input_path, encoding='utf-8', newline='') as f, \
+            ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        reader = read_chunks(f, chunksize, prefix * chunksize)
+        for offset, chunk in enumerate(reader):
+            index = prefix + offset
+            if index in completed:
+                continue
+            # Keep a bounded number of chunks in flight so memory stays flat
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(pool.submit(score_chunk, index, chunk, output_dir, version))
+        collect(pending)
+
+    checkpoint['finished'] = True
+    save_checkpoint(output_dir, checkpoint)
+
+    elapsed = time.perf_counter() - started
+    print(f"\n[OK] Scored {checkpoint['rows_scored']:,} rows with model {version}")
+    if checkpoint['rows_skipped']:
+        print(f"   Skipped {checkpoint['rows_skipped']:,} rows with labels unknown to the encoders")
+    print(f"   This run: {rows_this_run:,} rows in {elapsed:.1f}s "
+          f"({rows_this_run / max(elapsed, 1e-9):,.0f} rows/sec)")
+    return checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk re-score the beneficiary roster")
+    parser.add_argument('--input', default='beneficiary_data.csv')
+    parser.add_argument('--output-dir', default='rescored')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--restart', action='store_true',
+                        help="Ignore any existing checkpoint and score everything again")
+    parser.add_argument('--merge', metavar='CSV',
+                        help="Write the re-scored roster to this file when done")
+    args = parser.parse_args()
+
+    print("Re-scoring beneficiary roster...\n")
+    checkpoint = run(args.input, args.output_dir, args.workers, args.chunksize, args.restart)
+
+    if args.merge:
+        merge_parts(args.output_dir, checkpoint, args.merge)
+        print(f"[OK] Re-scored roster saved to: {args.merge}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Multi-process server for the NourishAI API.
+
+The parent process imports ``backend`` once (models, encoders and roster),
+moves the roster into memory-mapped column files and then forks the workers.
+Workers inherit the already-loaded ensembles copy-on-write and read the roster
+from the shared page cache, so memory stays nearly flat as workers are added.
+
+Usage:
+    python serve.py --workers 4 --port 8000
+"""
+import argparse
+import gc
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import threading
+
+import uvicorn
+
+import backend
+import roster_store
+
+
+def share_roster(roster_dir=None):
+    """Swap ``backend.df`` for a read-only, memory-mapped copy of the roster"""
+    roster_dir = roster_dir or tempfile.mkdtemp(prefix='nourishai-roster-')
+    roster_store.export_roster(backend.df, roster_dir)
+    backend.df = roster_store.load_roster(roster_dir)
+    # Sync reads from the shared copy; writes are refused since workers cannot share them
+    backend.sync_store.frame = backend.df
+    # Chat sessions are per-process too; a beneficiary's messages would be split across workers
+    backend.chat_sessions = None
+    return roster_dir
+
+
+def bind_socket(host, port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock, log_level):
+    """Serve requests on the inherited listening socket until told to stop"""
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGHUP, signal.SIG_DFL)
+    # POST /models/reload in any worker asks the parent (SIGHUP) to tell every worker (SIGUSR1)
+    backend.broadcast_reload = lambda: os.kill(os.getppid(), signal.SIGHUP)
+    signal.signal(signal.SIGUSR1,
+                  lambda signum, frame: threading.Thread(target=backend.reload_if_changed, daemon=True).start())
+    config = uvicorn.Config(backend.app, log_level=log_level, access_log=False)
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-forking NourishAI API server")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--roster-dir', default=None,
+                        help="Directory for the memory-mapped roster (default: temporary)")
+    parser.add_argument('--log-level', default='warning')
+    args = parser.parse_args()
+
+    keep_roster_dir = args.roster_dir is not None
+    roster_dir = share_roster(args.roster_dir)
+    sock = bind_socket(args.host, args.port)
+
+    # Move everything loaded so far out of the collector's reach; otherwise the
+    # first GC pass in each worker would touch (and copy) every shared page.
+    gc.collect()
+    gc.freeze()
+
+    children = []
+
+    def broadcast_reload(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGUSR1)
+            except ProcessLookupError:
+                pass
+
+    # Installed before forking so neither signal can reach a default handler, which would exit
+    signal.signal(signal.SIGHUP, broadcast_reload)
+    signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+    for _ in range(args.workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(sock, args.log_level)
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    print(f"[OK] Serving on http://{args.host}:{args.port} with {args.workers} workers "
+          f"(parent pid {os.getpid()})", flush=True)
+
+    def stop(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    try:
+        for pid in children:
+            while True:
+                try:
+                    os.waitpid(pid, 0)
+                    break
+                except InterruptedError:
+                    continue
+                except ChildProcessError:
+                    break
+    finally:
+        sock.close()
+        if not keep_roster_dir:
+            shutil.rmtree(roster_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
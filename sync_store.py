@@ -0,0 +1,248 @@
+import bisect
+import json
+import math
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Columns managed by the store itself; clients cannot set them
+PROTECTED_COLUMNS = ('beneficiary_id', 'version')
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+# Text columns limited to the values already in the roster
+CATEGORY_COLUMNS = ('age_group', 'gender', 'region', 'risk_category')
+
+
+class SyncError(ValueError):
+    """Raised for malformed change batches"""
+
+
+def parse_timestamp(value):
+    """Naive local datetime from TIMESTAMP_FORMAT or ISO 8601; raises SyncError otherwise"""
+    if not isinstance(value, str):
+        raise SyncError(f"Timestamp must be a string; got {value!r}")
+    try:
+        parsed = datetime.strptime(value, TIMESTAMP_FORMAT)
+    except ValueError:
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            raise SyncError(f"Invalid timestamp: {value!r}")
+    if parsed.tzinfo is not None:
+        # Roster timestamps are server local time
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.replace(microsecond=0)
+
+
+class SyncStore:
+    """Change-sequence bookkeeping for delta sync of the beneficiary roster.
+
+    Every row carries a ``version``: the global sequence number of the last
+    change made to it. A log of (sequence, row position) entries in sequence
+    order lets a client that last synced at ``since`` fetch only the rows
+    changed after it, with a binary search instead of a roster scan.
+    Applied changes are appended to a JSONL log and replayed on startup.
+    """
+
+    def __init__(self, frame, log_path=None, categories=None):
+        if 'version' not in frame.columns:
+            frame['version'] = np.arange(1, len(frame) + 1, dtype=np.int64)
+        self.frame = frame
+        self.log_path = log_path
+        versions = frame['version'].to_numpy()
+        order = np.argsort(versions, kind='stable')
+        self._log_seqs = versions[order].tolist()
+        self._log_positions = order.tolist()
+        # Device that made each change, so its own changes are not echoed back
+        self._origins = {}
+        self.seq = int(versions.max()) if len(versions) else 0
+        self.index = {bid: i for i, bid in enumerate(frame['beneficiary_id'].astype(str))}
+        # New records by position, appended to the frame together by _flush
+        self._pending = {}
+        if categories is None:
+            categories = {col: frame[col].dropna().astype(str).unique() for col in CATEGORY_COLUMNS
+                          if col in frame.columns}
+        self.categories = {col: set(values) for col, values in categories.items()}
+        self._lock = threading.Lock()
+
+        if log_path and os.path.exists(log_path):
+            self._replay(log_path)
+
+    @property
+    def writable(self):
+        """False when the roster is a read-only memory-mapped copy (see serve.py)"""
+        return self.frame['version'].to_numpy().flags.writeable
+
+    def _replay(self, path):
+        with open(path, encoding='utf-8') as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        skipped = 0
+        for entry in entries:
+            fields = dict(entry['fields'])
+            try:
+                self._validate(fields)
+                fields['last_updated'] = parse_timestamp(fields['last_updated']).strftime(TIMESTAMP_FORMAT)
+            except (SyncError, KeyError):
+                # Entries written before values were validated
+                skipped += 1
+                continue
+            self._write(entry['beneficiary_id'], fields, entry['device_id'], persist=False)
+        self._flush()
+        if skipped:
+            print(f"[WARN] Skipped {skipped} invalid entries in {path}")
+
+    def _write(self, beneficiary_id, fields, device_id, persist=True):
+        """Apply one change and give the row a new version. Returns its position"""
+        self.seq += 1
+        values = dict(fields, version=self.seq)
+        position = self.index.get(beneficiary_id)
+        if position is None:
+            position = len(self.frame) + len(self._pending)
+            self._pending[position] = dict(values, beneficiary_id=beneficiary_id)
+            self.index[beneficiary_id] = position
+        elif position in self._pending:
+            self._pending[position].update(values)
+        else:
+            for column, value in values.items():
+                self.frame.iat[position, self.frame.columns.get_loc(column)] = value
+
+        self._log_seqs.append(self.seq)
+        self._log_positions.append(position)
+        self._origins[self.seq] = device_id
+        if persist and self.log_path:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'beneficiary_id': beneficiary_id, 'fields': fields,
+                                    'device_id': device_id}, ensure_ascii=False) + '\n')
+        return position
+
+    def _flush(self):
+        """Append pending new records with a single concat"""
+        if self._pending:
+            rows = pd.DataFrame(list(self._pending.values()))
+            self.frame = pd.concat([self.frame, rows], ignore_index=True)
+            self._pending = {}
+
+    def _validate(self, fields):
+        """Check field names and values, and coerce values to the column types"""
+        for column, value in fields.items():
+            if column in PROTECTED_COLUMNS:
+                raise SyncError(f"Column {column} cannot be changed by clients")
+            if column not in self.frame.columns:
+                raise SyncError(f"Unknown column: {column}")
+            if column in self.categories:
+                if not isinstance(value, str) or value not in self.categories[column]:
+                    raise SyncError(f"Unknown {column}: {value!r}")
+                continue
+            dtype = self.frame[column].dtype
+            if not pd.api.types.is_numeric_dtype(dtype):
+                if value is not None and not isinstance(value, str):
+                    raise SyncError(f"Column {column} needs text; got {value!r}")
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+                raise SyncError(f"Column {column} needs a number; got {value!r}")
+            if pd.api.types.is_integer_dtype(dtype):
+                if value != int(value):
+                    raise SyncError(f"Column {column} needs a whole number; got {value!r}")
+                fields[column] = int(value)
+
+    def _missing_columns(self, fields):
+        """Columns a new record must provide but does not"""
+        automatic = set(PROTECTED_COLUMNS) | {'last_updated'}
+        return [col for col in self.frame.columns if col not in automatic and col not in fields]
+
+    def apply(self, changes, device_id):
+        """Apply a batch of client changes.
+
+        Each change is ``{beneficiary_id, base_version, updated_at, fields}``.
+        A change whose ``base_version`` matches the row's current version is
+        applied. Otherwise the newer of the client's ``updated_at`` and the
+        row's ``last_updated`` wins and the clash is reported as a conflict.
+        The whole batch is rejected with SyncError if any change has an
+        invalid value or timestamp.
+
+        Returns (accepted, conflicts, positions, previous rows) so derived
+        aggregates can be updated for just the touched rows.
+        """
+        timestamps = []
+        for change in changes:
+            self._validate(change['fields'])
+            updated_at = change.get('updated_at')
+            timestamps.append(parse_timestamp(updated_at) if updated_at else datetime.now().replace(microsecond=0))
+
+        accepted, conflicts, positions, previous = [], [], [], []
+        with self._lock:
+            for change, updated_at in zip(changes, timestamps):
+                beneficiary_id = change['beneficiary_id']
+                fields = dict(change['fields'], last_updated=updated_at.strftime(TIMESTAMP_FORMAT))
+                position = self.index.get(beneficiary_id)
+                if position in self._pending:
+                    # A record created earlier in this batch
+                    self._flush()
+
+                if position is None:
+                    if change.get('base_version') is not None:
+                        conflicts.append({'beneficiary_id': beneficiary_id, 'resolution': 'rejected',
+                                          'reason': 'unknown_record'})
+                        continue
+                    missing = self._missing_columns(fields)
+                    if missing:
+                        conflicts.append({'beneficiary_id': beneficiary_id, 'resolution': 'rejected',
+                                          'reason': f"missing columns: {', '.join(missing)}"})
+                        continue
+                    previous.append(None)
+                else:
+                    current_version = int(self.frame['version'].iat[position])
+                    if change.get('base_version') != current_version:
+                        try:
+                            server_updated = parse_timestamp(str(self.frame['last_updated'].iat[position]))
+                        except SyncError:
+                            server_updated = datetime.min
+                        if updated_at <= server_updated:
+                            conflicts.append({
+                                'beneficiary_id': beneficiary_id,
+                                'resolution': 'server_wins',
+                                'server_record': self.records([position])[0],
+                            })
+                            continue
+                        conflicts.append({'beneficiary_id': beneficiary_id, 'resolution': 'client_wins'})
+                    previous.append(self.frame.iloc[[position]].copy())
+
+                position = self._write(beneficiary_id, fields, device_id)
+                positions.append(position)
+                accepted.append({'beneficiary_id': beneficiary_id, 'version': self.seq})
+            self._flush()
+
+        return accepted, conflicts, positions, previous
+
+    def changes_since(self, since, device_id=None, limit=500):
+        """Rows changed after sequence ``since``, oldest change first.
+
+        Returns (records, next_since, more); pass ``next_since`` back as
+        ``since`` to continue. Superseded log entries and changes made by
+        ``device_id`` itself are skipped.
+        """
+        # A page of at least one entry, so a caller following ``more`` always advances
+        limit = max(int(limit), 1)
+        with self._lock:
+            start = bisect.bisect_right(self._log_seqs, since)
+            positions, cursor = [], since
+            versions = self.frame['version'].to_numpy()
+            i = start
+            while i < len(self._log_seqs) and len(positions) < limit:
+                seq, position = self._log_seqs[i], self._log_positions[i]
+                cursor = seq
+                i += 1
+                if versions[position] != seq:
+                    continue
+                if device_id is not None and self._origins.get(seq) == device_id:
+                    continue
+                positions.append(position)
+            more = i < len(self._log_seqs)
+            return self.records(positions), cursor, more
+
+    def records(self, positions):
+        rows = self.frame.iloc[positions]
+        # NaN is not valid JSON; send missing values as null
+        return rows.astype(object).where(rows.notna(), None).to_dict('records')
@@ -0,0 +1,52 @@
+import threading
+
+from api_client import ApiClient
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Answers with the given statuses in turn, then 200"""
+
+    def __init__(self, statuses=()):
+        self.statuses = list(statuses)
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self._lock:
+            status = self.statuses.pop(0) if self.statuses else 200
+        return Response(status)
+
+    def close(self):
+        pass
+
+
+def client(statuses=()):
+    api = ApiClient('http://api.test', backoff=0)
+    api.session = FakeSession(statuses)
+    return api
+
+
+def test_retries_transient_statuses():
+    api = client([503, 502])
+    assert api.post('/sync', idempotent=True).status_code == 200
+    assert api.stats == {'requests': 3, 'coalesced': 0, 'retries': 2}
+    assert client([503]).post('/predict').status_code == 503
+
+
+def test_counts_are_exact_across_threads():
+    api = client()
+
+    def work():
+        for _ in range(500):
+            api.post('/predict')
+
+    threads = [threading.Thread(target=work) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert api.stats['requests'] == 16 * 500
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cohort
+from cohort import CohortEngine
+
+
+def roster():
+    return pd.DataFrame({
+        'beneficiary_id': ['BEN00001', 'BEN00002', 'BEN00003'],
+        'region': ['Bihar', 'Kerala', 'Bihar'],
+        'risk_score': [70.0, 20.0, 45.0],
+    })
+
+
+def test_update_rows_overwrites_and_appends():
+    frame = roster()
+    engine = CohortEngine(frame)
+    frame.loc[1, 'region'] = 'Assam'
+    frame.loc[3] = ['BEN00004', 'Assam', 90.0]
+    engine.update_rows(frame.iloc[[1, 3]], [1, 3])
+
+    assert engine.rows == 4
+    assert engine.query("region == 'Assam'")['rows_matched'] == 2
+    assert engine.query("region == 'Kerala'")['rows_matched'] == 0
+    result = engine.query(group_by=['region'], aggregations={'risk_score': ['max']})
+    assert {g['region']: g['risk_score_max'] for g in result['groups']} == {'Assam': 90.0, 'Bihar': 70.0}
+    assert engine.lookup['region'] == {value: code for code, value in enumerate(engine.categories['region'])}
+
+
+def test_filter_on_unseen_value_matches_nothing():
+    engine = CohortEngine(roster())
+    assert engine.query("region == 'Goa'")['rows_matched'] == 0
+    assert engine.query("region != 'Goa'")['rows_matched'] == 3
+    assert np.array_equal(engine.filter_mask("region in ['Kerala', 'Goa']"), [False, True, False])
+
+
+def test_group_by_high_cardinality_dimensions_keeps_groups_apart():
+    # 4 dimensions of 70,000 values: the product of cardinalities is past int64
+    n = 70_000
+    frame = pd.DataFrame({name: np.arange(n) for name in ['a', 'b', 'c', 'd']})
+    frame['risk_score'] = np.arange(n, dtype=np.float64)
+    engine = CohortEngine(frame)
+    result = engine.query(group_by=['a', 'b', 'c', 'd'], aggregations={'risk_score': ['max']})
+    assert len(result['groups']) == n
+    assert all(g['a'] == g['b'] == g['c'] == g['d'] == g['risk_score_max'] for g in result['groups'])
+
+
+def test_group_by_several_dimensions():
+    frame = roster()
+    frame['gender'] = ['Female', 'Male', 'Male']
+    engine = CohortEngine(frame)
+    result = engine.query(group_by=['region', 'gender'])
+    assert [(g['region'], g['gender'], g['count']) for g in result['groups']] == [
+        ('Bihar', 'Female', 1), ('Bihar', 'Male', 1), ('Kerala', 'Male', 1)]
+    assert engine.query()['groups'] == [{'count': 3}]
+
+
+@pytest.mark.parametrize('segment_groups', [4096, 0])
+def test_order_statistics_match_pandas(monkeypatch, segment_groups):
+    # Both the per-group sort and the single global sort
+    monkeypatch.setattr(cohort, '_SEGMENT_SORT_GROUPS', segment_groups)
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({'region': rng.choice(['Bihar', 'Kerala', 'Assam', 'Goa'], 5000),
+                          'gender': rng.choice(['Female', 'Male'], 5000),
+                          'risk_score': rng.normal(50, 15, 5000).round(1)})
+    engine = CohortEngine(frame)
+    result = engine.query("region != 'Goa'", group_by=['region', 'gender'],
+                          aggregations={'risk_score': ['min', 'median', 'p25', 'p90', 'max']})
+    grouped = frame[frame['region'] != 'Goa'].groupby(['region', 'gender'])['risk_score']
+    for group in result['groups']:
+        values = grouped.get_group((group['region'], group['gender']))
+        assert group['risk_score_min'] == values.min()
+        assert group['risk_score_max'] == values.max()
+        for name, q in [('median', 0.5), ('p25', 0.25), ('p90', 0.9)]:
+            assert group[f'risk_score_{name}'] == pytest.approx(values.quantile(q), abs=1e-3)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from drift_monitor import MAX_CATEGORIES, OTHER, DriftMonitor, build_baseline, psi
+
+REGIONS = ['Bihar', 'Kerala', 'Assam', 'Goa']
+
+
+def inputs(rows, seed, protein_mean=40.0, region_shares=(0.4, 0.3, 0.2, 0.1)):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'meals_per_day': rng.integers(1, 5, rows),
+        'food_diversity_score': rng.integers(1, 9, rows),
+        'protein_intake_g': rng.normal(protein_mean, 8.0, rows).round(1),
+        'calorie_intake_kcal': rng.normal(1400, 200, rows).round(),
+        'attendance_rate': rng.uniform(0.3, 1.0, rows).round(2),
+        'days_since_last_check': rng.integers(0, 90, rows),
+        'age_group': rng.choice(['0-2 years', '3-5 years', '6-12 years'], rows),
+        'gender': rng.choice(['Female', 'Male'], rows),
+        'region': rng.choice(REGIONS, rows, p=region_shares),
+    })
+
+
+@pytest.fixture(scope='module')
+def baseline():
+    return build_baseline(inputs(20000, seed=0))
+
+
+def test_psi_is_zero_for_identical_distributions():
+    assert psi([0.2, 0.3, 0.5], [0.2, 0.3, 0.5]) == 0.0
+    assert psi([0.5, 0.5], [0.9, 0.1]) > 0.25
+
+
+def test_stream_like_the_baseline_is_stable(baseline):
+    monitor = DriftMonitor(baseline, window=5000)
+    monitor.record_frame(inputs(4000, seed=1))
+    report = monitor.report()
+    assert report['status'] == 'stable'
+    assert all(feature['status'] == 'stable' for feature in report['features'].values())
+
+
+def test_shifted_stream_is_flagged(baseline):
+    monitor = DriftMonitor(baseline, window=5000)
+    monitor.record_frame(inputs(4000, seed=1, protein_mean=55.0, region_shares=(0.1, 0.1, 0.1, 0.7)))
+    report = monitor.report()
+    assert report['status'] == 'significant'
+    assert report['features']['protein_intake_g']['status'] == 'significant'
+    assert report['features']['protein_intake_g']['ks'] > 0.3
+    assert report['features']['region']['largest_shift'] == 'Goa'
+    assert report['features']['meals_per_day']['status'] == 'stable'
+
+
+def test_record_and_record_frame_count_the_same(baseline):
+    frame = inputs(500, seed=2)
+    one_by_one, batched = DriftMonitor(baseline), DriftMonitor(baseline)
+    for row in frame.to_dict('records'):
+        one_by_one.record(row)
+    batched.record_frame(frame)
+    assert one_by_one._current['numeric'] == batched._current['numeric']
+    assert one_by_one._current['categorical'] == batched._current['categorical']
+    assert one_by_one._current['sums'] == pytest.approx(batched._current['sums'])
+    assert one_by_one.report() == batched.report()
+
+
+def test_report_covers_the_last_one_to_two_windows(baseline):
+    monitor = DriftMonitor(baseline, window=100, min_rows=50)
+    for row in inputs(250, seed=3).to_dict('records'):
+        monitor.record(row)
+    report = monitor.report()
+    # Rows 101-200 in the previous window, 201-250 in the current one
+    assert (report['rows'], report['total_rows']) == (150, 250)
+
+    monitor = DriftMonitor(baseline, window=100, min_rows=200)
+    monitor.record_frame(inputs(150, seed=3))
+    assert monitor.report()['status'] == 'insufficient_data'
+
+
+def test_unknown_categories_overflow_into_one_counter(baseline):
+    monitor = DriftMonitor(baseline, min_rows=1)
+    frame = inputs(MAX_CATEGORIES + 20, seed=4)
+    frame['region'] = [f'Region {i}' for i in range(len(frame))]
+    for row in frame.to_dict('records'):
+        monitor.record(row)
+    counts = monitor._current['categorical']['region']
+    assert len(counts) == MAX_CATEGORIES + 1
+    assert counts[OTHER] == 20
+    assert sum(counts.values()) == len(frame)
+    region = monitor.report()['features']['region']
+    assert region['status'] == 'significant'
+    assert len(region['unseen']) == 10
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from edge_scorer import EdgeScorer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILE = {
+    'age_group': '3-5 years', 'gender': 'Female', 'region': 'Maharashtra',
+    'meals_per_day': 2, 'food_diversity_score': 3, 'protein_intake_g': 25.0,
+    'calorie_intake_kcal': 1200.0, 'attendance_rate': 0.75, 'language': 'hi',
+}
+
+
+@pytest.fixture(scope='module')
+def scorer(tmp_path_factory):
+    import export_edge
+
+    output = str(tmp_path_factory.mktemp('edge') / 'nourishai_edge.npz')
+    with pytest.MonkeyPatch.context() as patch:
+        # Models and the phrase table are read from the repository root, offline
+        patch.chdir(ROOT)
+        patch.setenv('NOURISHAI_TRANSLATORS', 'phrases')
+        export_edge.export(output, value_step=0.001, proba_levels=255)
+    return EdgeScorer(output)
+
+
+def test_predicts_a_profile(scorer):
+    result = scorer.predict(PROFILE)
+    assert 0 <= result['risk_score'] <= 100
+    assert result['risk_category'] in scorer.classes
+    assert result['recommendations']
+
+
+def test_missing_fields_raise_value_error(scorer):
+    profile = dict(PROFILE)
+    del profile['protein_intake_g']
+    profile['region'] = None
+    with pytest.raises(ValueError, match='protein_intake_g') as error:
+        scorer.predict(profile)
+    assert 'region' in str(error.value)
+
+
+def test_unknown_label_raises_value_error(scorer):
+    with pytest.raises(ValueError, match='Atlantis'):
+        scorer.predict(dict(PROFILE, region='Atlantis'))
+
+
+def test_empty_batch(scorer):
+    assert scorer.predict_many([]) == []
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from geo_cube import SCORE_BIN_WIDTH, GeoCube
+
+DISTRICTS = {'Bihar': ['Gaya', 'Patna'], 'Kerala': ['Kollam'], 'Goa': ['North Goa']}
+
+
+def roster(rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    scores = rng.uniform(0, 100, rows).round(1)
+    return pd.DataFrame({
+        'beneficiary_id': [f'BEN{i:05d}' for i in range(rows)],
+        'region': rng.choice(['Bihar', 'Kerala'], rows),
+        'risk_score': scores,
+        'risk_category': np.where(scores >= 60, 'High', np.where(scores >= 30, 'Medium', 'Low')),
+        'days_since_last_check': rng.integers(0, 90, rows),
+    })
+
+
+def snapshot(cube):
+    country = cube.country()
+    states = {child['state']: cube.state(child['state']) for child in country['children']}
+    districts = {}
+    for state, result in states.items():
+        for child in result['children']:
+            summary, members = cube.district(state, child['district'])
+            districts[(state, child['district'])] = (summary, sorted(members.tolist()))
+    return country, states, districts
+
+
+def test_summary_matches_the_roster():
+    frame = roster()
+    summary = GeoCube.from_frame(frame, DISTRICTS).country()['summary']
+    assert summary['count'] == len(frame)
+    assert summary['risk_counts'] == frame['risk_category'].value_counts().reindex(
+        ['High', 'Medium', 'Low'], fill_value=0).to_dict()
+    assert summary['avg_risk_score'] == round(frame['risk_score'].mean(), 1)
+    assert summary['coverage_rate'] == round((frame['days_since_last_check'] <= 30).mean(), 3)
+    # Histogram quantiles are exact to within one bin
+    for name, q in [('p25', 0.25), ('p50', 0.5), ('p75', 0.75), ('p90', 0.9)]:
+        assert summary['risk_score_quantiles'][name] == pytest.approx(
+            frame['risk_score'].quantile(q), abs=SCORE_BIN_WIDTH + 0.1)
+
+
+def test_incremental_updates_match_a_rebuild():
+    frame = roster()
+    cube = GeoCube.from_frame(frame, DISTRICTS)
+
+    # As /sync does: remove each changed row in its old state, then add it back updated
+    updated = frame.copy()
+    changed = [0, 1, 2]
+    updated.loc[0, ['risk_score', 'risk_category']] = [95.0, 'High']
+    updated.loc[1, 'days_since_last_check'] = 0
+    # The only beneficiary in Goa, so its state and district appear
+    updated.loc[2, 'region'] = 'Goa'
+    for position in changed:
+        cube.remove_rows(frame.iloc[[position]], [position])
+    cube.add_rows(updated.iloc[changed], changed)
+
+    # A new beneficiary appended to the roster
+    updated.loc[len(updated)] = ['BEN99999', 'Kerala', 12.5, 'Low', 3]
+    cube.add_rows(updated.iloc[[len(updated) - 1]], [len(updated) - 1])
+    assert snapshot(cube) == snapshot(GeoCube.from_frame(updated, DISTRICTS))
+
+    # Moving the Goa beneficiary back empties the node, which is then dropped
+    cube.remove_rows(updated.iloc[[2]], [2])
+    updated.loc[2, 'region'] = 'Kerala'
+    cube.add_rows(updated.iloc[[2]], [2])
+    assert cube.state('Goa') is None
+    assert cube.district('Goa', 'North Goa') is None
+    assert snapshot(cube) == snapshot(GeoCube.from_frame(updated, DISTRICTS))
+
+
+def test_removing_every_row_empties_the_cube():
+    frame = roster(20)
+    cube = GeoCube.from_frame(frame, DISTRICTS)
+    cube.remove_rows(frame, np.arange(len(frame)))
+    assert cube.country() == {'summary': GeoCube(DISTRICTS).country()['summary'], 'children': []}
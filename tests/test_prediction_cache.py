@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+import prediction_cache
+from prediction_cache import PredictionCache, _entry_size, quantize
+
+
+def result(score):
+    return {'risk_score': score, 'risk_category': 'Low', 'confidence': 90.0,
+            'recommendations': ['Continue current nutrition practices']}
+
+
+def test_quantize_buckets_nearby_values():
+    assert quantize(41.04, 0.1) == quantize(40.96, 0.1) == 41.0
+    assert quantize(0.8449, 0.01) == 0.84
+
+
+def test_evicts_least_recently_used_under_the_byte_budget():
+    size = _entry_size(('a',), result(1.0))
+    cache = PredictionCache(max_bytes=3 * size)
+    for key in ('a', 'b', 'c'):
+        cache.put((key,), result(1.0))
+    # Reading 'a' makes 'b' the least recently used
+    assert cache.get(('a',)) is not None
+    cache.put(('d',), result(1.0))
+    assert cache.get(('b',)) is None
+    assert all(cache.get((key,)) is not None for key in ('a', 'c', 'd'))
+    stats = cache.stats()
+    assert (stats['entries'], stats['evictions']) == (3, 1)
+    assert stats['bytes'] <= cache.max_bytes
+
+
+def test_entry_limit_and_oversized_entries():
+    cache = PredictionCache(max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.put((key,), result(1.0))
+    assert cache.get(('a',)) is None
+    assert cache.stats()['entries'] == 2
+
+    tiny = PredictionCache(max_bytes=10)
+    tiny.put(('a',), result(1.0))
+    assert tiny.stats()['entries'] == 0
+
+
+def test_replacing_an_entry_keeps_the_byte_count():
+    cache = PredictionCache()
+    cache.put(('a',), result(1.0))
+    before = cache.stats()['bytes']
+    cache.put(('a',), result(2.0))
+    assert cache.stats()['bytes'] == before
+    assert cache.get(('a',))['risk_score'] == 2.0
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(prediction_cache.time, 'monotonic', lambda: now[0])
+    cache = PredictionCache(ttl=60)
+    cache.put(('a',), result(1.0))
+    now[0] += 59
+    assert cache.get(('a',)) is not None
+    now[0] += 2
+    assert cache.get(('a',)) is None
+    stats = cache.stats()
+    assert (stats['entries'], stats['bytes'], stats['evictions']) == (0, 0, 1)
+
+
+def test_clear_empties_the_cache():
+    cache = PredictionCache()
+    cache.put(('a',), result(1.0))
+    cache.clear()
+    assert cache.get(('a',)) is None
+    stats = cache.stats()
+    assert (stats['entries'], stats['bytes'], stats['invalidations']) == (0, 0, 1)
+
+
+def test_model_reload_clears_the_cache(monkeypatch):
+    # backend loads its models and roster relative to the repository root
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    backend = pytest.importorskip('backend')
+    cache = PredictionCache()
+    monkeypatch.setattr(backend, 'prediction_cache', cache)
+    cache.put((backend.MODEL_VERSION, 'en'), result(1.0))
+    backend.load_models()
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['invalidations'] == 1
@@ -0,0 +1,32 @@
+import io
+
+import pandas as pd
+
+from score_roster import read_chunks
+
+
+def roster_csv(rows):
+    frame = pd.DataFrame({'beneficiary_id': [f'BEN{i:05d}' for i in range(rows)],
+                          'region': ['Bihar, North' if i % 2 else 'Kerala' for i in range(rows)],
+                          'meals_per_day': [i % 4 for i in range(rows)]})
+    return frame, frame.to_csv(index=False)
+
+
+def test_read_chunks_matches_read_csv():
+    frame, text = roster_csv(10)
+    chunks = list(read_chunks(io.StringIO(text), chunksize=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), frame)
+
+
+def test_read_chunks_skips_completed_rows():
+    frame, text = roster_csv(10)
+    chunks = list(read_chunks(io.StringIO(text), chunksize=4, skip_rows=8))
+    assert len(chunks) == 1
+    assert chunks[0]['beneficiary_id'].tolist() == ['BEN00008', 'BEN00009']
+    assert list(chunks[0].columns) == list(frame.columns)
+
+
+def test_read_chunks_skipping_past_the_end_is_empty():
+    _, text = roster_csv(3)
+    assert list(read_chunks(io.StringIO(text), chunksize=4, skip_rows=8)) == []
@@ -0,0 +1,208 @@
+import json
+
+import pandas as pd
+import pytest
+
+from sync_store import SyncError, SyncStore, parse_timestamp
+
+
+def roster():
+    return pd.DataFrame({
+        'beneficiary_id': ['BEN00001', 'BEN00002'],
+        'name': ['Asha Devi', 'Ravi Kumar'],
+        'age_group': ['0-2 years', '3-5 years'],
+        'gender': ['Female', 'Male'],
+        'region': ['Bihar', 'Kerala'],
+        'meals_per_day': [3, 2],
+        'protein_intake_g': [40.0, 25.5],
+        'risk_category': ['Low', 'High'],
+        'last_updated': ['2025-12-05 16:06:13', '2025-12-30 16:06:13'],
+    })
+
+
+def new_record(**fields):
+    record = {'name': 'Meena', 'age_group': '0-2 years', 'gender': 'Female', 'region': 'Bihar',
+              'meals_per_day': 3, 'protein_intake_g': 30.0, 'risk_category': 'Low'}
+    record.update(fields)
+    return record
+
+
+def change(beneficiary_id, fields, base_version=None, updated_at=None):
+    return {'beneficiary_id': beneficiary_id, 'base_version': base_version,
+            'updated_at': updated_at, 'fields': fields}
+
+
+def test_matching_base_version_is_applied():
+    store = SyncStore(roster())
+    accepted, conflicts, positions, _ = store.apply([change('BEN00001', {'meals_per_day': 4}, base_version=1)], 'd1')
+    assert conflicts == []
+    assert positions == [0]
+    assert accepted == [{'beneficiary_id': 'BEN00001', 'version': 3}]
+    assert store.frame.at[0, 'meals_per_day'] == 4
+    assert store.frame.at[0, 'version'] == 3
+
+
+def test_stale_change_older_than_server_loses():
+    store = SyncStore(roster())
+    accepted, conflicts, _, _ = store.apply(
+        [change('BEN00002', {'meals_per_day': 5}, base_version=1, updated_at='2025-12-29 10:00:00')], 'd1')
+    assert accepted == []
+    assert conflicts[0]['resolution'] == 'server_wins'
+    assert conflicts[0]['server_record']['meals_per_day'] == 2
+    assert store.frame.at[1, 'meals_per_day'] == 2
+
+
+def test_stale_change_newer_than_server_wins():
+    store = SyncStore(roster())
+    accepted, conflicts, _, _ = store.apply(
+        [change('BEN00002', {'meals_per_day': 5}, base_version=1, updated_at='2025-12-31 09:00:00')], 'd1')
+    assert conflicts == [{'beneficiary_id': 'BEN00002', 'resolution': 'client_wins'}]
+    assert len(accepted) == 1
+    assert store.frame.at[1, 'meals_per_day'] == 5
+    assert store.frame.at[1, 'last_updated'] == '2025-12-31 09:00:00'
+
+
+def test_iso_timestamps_compare_as_times():
+    # As strings, 'T' sorts after ' ' and this earlier ISO time would win
+    store = SyncStore(roster())
+    _, conflicts, _, _ = store.apply(
+        [change('BEN00002', {'meals_per_day': 5}, base_version=1, updated_at='2025-12-30T08:00:00')], 'd1')
+    assert conflicts[0]['resolution'] == 'server_wins'
+
+
+def test_updated_at_is_stored_normalized():
+    store = SyncStore(roster())
+    store.apply([change('BEN00001', {'meals_per_day': 4}, base_version=1,
+                        updated_at='2026-01-02T03:04:05.678')], 'd1')
+    assert store.frame.at[0, 'last_updated'] == '2026-01-02 03:04:05'
+
+
+@pytest.mark.parametrize('updated_at', ['garbage', '2025-13-01 00:00:00', '31/12/2025'])
+def test_invalid_updated_at_is_rejected(updated_at):
+    store = SyncStore(roster())
+    with pytest.raises(SyncError):
+        store.apply([change('BEN00002', {'meals_per_day': 5}, base_version=1, updated_at=updated_at)], 'd1')
+    assert store.frame.at[1, 'meals_per_day'] == 2
+
+
+@pytest.mark.parametrize('fields', [
+    {'region': {'a': 1}},
+    {'region': 'Atlantis'},
+    {'risk_category': None},
+    {'name': ['Asha']},
+    {'meals_per_day': '3'},
+    {'meals_per_day': 2.5},
+    {'meals_per_day': True},
+    {'protein_intake_g': float('nan')},
+    {'version': 10},
+    {'unknown_column': 1},
+])
+def test_invalid_values_are_rejected(fields):
+    store = SyncStore(roster())
+    seq = store.seq
+    with pytest.raises(SyncError):
+        store.apply([change('BEN00001', {'meals_per_day': 4}, base_version=1),
+                     change('BEN00002', fields, base_version=2)], 'd1')
+    # The whole batch is refused, including its valid changes
+    assert store.seq == seq
+    assert store.frame.at[0, 'meals_per_day'] == 3
+
+
+def test_text_columns_accept_strings_and_null():
+    store = SyncStore(roster())
+    accepted, _, _, _ = store.apply([change('BEN00001', {'name': None}, base_version=1),
+                                     change('BEN00002', {'name': 'Ravi K.', 'region': 'Bihar'}, base_version=2)], 'd1')
+    assert len(accepted) == 2
+    assert store.frame.at[1, 'region'] == 'Bihar'
+
+
+def test_new_records_need_every_column():
+    store = SyncStore(roster())
+    accepted, conflicts, _, _ = store.apply([change('BEN00003', {'name': 'Meena'})], 'd1')
+    assert accepted == []
+    assert conflicts[0]['resolution'] == 'rejected'
+    assert 'missing columns' in conflicts[0]['reason']
+
+
+def test_new_records_are_appended():
+    store = SyncStore(roster())
+    accepted, conflicts, positions, previous = store.apply(
+        [change('BEN00003', new_record()), change('BEN00004', new_record(name='Sita'))], 'd1')
+    assert conflicts == []
+    assert positions == [2, 3]
+    assert previous == [None, None]
+    assert store.frame['beneficiary_id'].tolist()[2:] == ['BEN00003', 'BEN00004']
+    assert store.frame['version'].tolist() == [1, 2, 3, 4]
+
+
+def test_changes_since_skips_own_and_superseded_changes():
+    store = SyncStore(roster())
+    store.apply([change('BEN00001', {'meals_per_day': 4}, base_version=1)], 'd1')
+    store.apply([change('BEN00001', {'meals_per_day': 5}, base_version=3)], 'd2')
+    records, next_since, more = store.changes_since(2, device_id='d2')
+    assert records == []
+    records, next_since, more = store.changes_since(2, device_id='d1')
+    assert [r['meals_per_day'] for r in records] == [5]
+    assert (next_since, more) == (4, False)
+
+
+def test_log_replay_restores_changes(tmp_path):
+    log = str(tmp_path / 'sync.jsonl')
+    store = SyncStore(roster(), log_path=log)
+    store.apply([change('BEN00001', {'meals_per_day': 4}, base_version=1),
+                 change('BEN00003', new_record(), updated_at='2026-01-01T10:00:00')], 'd1')
+
+    replayed = SyncStore(roster(), log_path=log)
+    assert replayed.seq == store.seq
+    assert replayed.frame.at[0, 'meals_per_day'] == 4
+    assert replayed.frame['beneficiary_id'].tolist()[-1] == 'BEN00003'
+    assert replayed.frame['last_updated'].tolist()[-1] == '2026-01-01 10:00:00'
+
+
+def test_log_replay_skips_invalid_entries(tmp_path):
+    log = tmp_path / 'sync.jsonl'
+    entries = [
+        {'beneficiary_id': 'BEN00001', 'device_id': 'd1',
+         'fields': {'region': {'a': 1}, 'last_updated': '2026-01-01 00:00:00'}},
+        {'beneficiary_id': 'BEN00002', 'device_id': 'd1',
+         'fields': {'meals_per_day': 1, 'last_updated': 'garbage'}},
+        {'beneficiary_id': 'BEN00001', 'device_id': 'd1',
+         'fields': {'meals_per_day': 4, 'last_updated': '2026-01-01 00:00:00'}},
+    ]
+    log.write_text(''.join(json.dumps(entry) + '\n' for entry in entries))
+
+    store = SyncStore(roster(), log_path=str(log))
+    assert store.seq == 3
+    assert store.frame.at[0, 'region'] == 'Bihar'
+    assert store.frame.at[0, 'meals_per_day'] == 4
+    assert store.frame.at[1, 'meals_per_day'] == 2
+
+
+def test_parse_timestamp_converts_time_zones_to_local():
+    parsed = parse_timestamp('2026-01-01T00:00:00+00:00')
+    assert parsed.tzinfo is None
+
+
+def test_new_record_changed_again_in_the_same_batch():
+    store = SyncStore(roster())
+    accepted, conflicts, positions, _ = store.apply(
+        [change('BEN00003', new_record()),
+         change('BEN00003', {'meals_per_day': 1}, base_version=3),
+         change('BEN00004', new_record(name='Sita'))], 'd1')
+    assert conflicts == []
+    assert positions == [2, 2, 3]
+    assert store.frame.at[2, 'meals_per_day'] == 1
+    assert store.frame.at[2, 'version'] == 4
+    assert store.frame['beneficiary_id'].tolist() == ['BEN00001', 'BEN00002', 'BEN00003', 'BEN00004']
+
+
+@pytest.mark.parametrize('limit', [-1, 0])
+def test_changes_since_always_advances(limit):
+    store = SyncStore(roster())
+    store.apply([change('BEN00001', {'meals_per_day': 4}, base_version=1)], 'd1')
+    records, next_since, more = store.changes_since(0, limit=limit)
+    assert [r['beneficiary_id'] for r in records] == ['BEN00002']
+    assert (next_since, more) == (2, True)
+    records, next_since, more = store.changes_since(next_since, limit=limit)
+    assert [r['beneficiary_id'] for r in records] == ['BEN00001']
+    assert (next_since, more) == (3, False)
@@ -0,0 +1,52 @@
+from translation import PhraseTableTranslator, TranslatorChain
+
+
+class Uppercase:
+    """Backend that translates only the texts it is told to"""
+
+    name = 'upper'
+
+    def __init__(self, known):
+        self.known = known
+
+    def translate_batch(self, texts, target_lang, source_lang='auto'):
+        return [text.upper() if text in self.known else None for text in texts]
+
+    def stats(self):
+        return {}
+
+
+def test_chain_falls_through_in_order():
+    table = {'hi': {'Good': 'अच्छा', 'I ate {items} items.': 'मैंने {items} चीज़ें खाईं।'}}
+    chain = TranslatorChain([PhraseTableTranslator(table), Uppercase({'Good', 'Bad'})])
+    translated, complete = chain.translate_checked(['Good', 'I ate 3 items.', 'Bad'], 'hi', 'en')
+    assert translated == ['अच्छा', 'मैंने 3 चीज़ें खाईं।', 'BAD']
+    assert complete
+    assert chain.stats()['hits'] == {'phrases': 2, 'upper': 1}
+
+
+def test_chain_reports_untranslated_texts():
+    chain = TranslatorChain([Uppercase({'Good'})])
+    translated, complete = chain.translate_checked(['Good', 'Unknown'], 'hi', 'en')
+    assert translated == ['GOOD', 'Unknown']
+    assert not complete
+    assert chain.translate_batch(['Unknown'], 'hi', 'en') == ['Unknown']
+    assert chain.stats()['untranslated'] == 2
+
+
+def test_chain_flags_each_untranslated_text():
+    chain = TranslatorChain([Uppercase({'Good'})])
+    assert chain.translate_each(['Unknown', 'Good'], 'hi', 'en') == (['Unknown', 'GOOD'], [False, True])
+
+
+def test_phrase_table_covers_every_api_message():
+    from recommendations import api_messages
+    from translation import load_phrase_table, placeholders
+
+    table = load_phrase_table()
+    assert table, "translations.json should ship with at least one curated language"
+    for lang, phrases in table.items():
+        missing = [message for message in api_messages() if message not in phrases]
+        assert not missing, f"{lang} lacks {missing}"
+        for source, target in phrases.items():
+            assert sorted(placeholders(source)) == sorted(placeholders(target)), (lang, source)
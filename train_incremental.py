@@ -0,0 +1,163 @@
+"""Update the models from assessments added since they were trained.
+
+Instead of retraining on the whole history, the risk score model gets extra
+boosting stages (warm start) fit on the new rows only, and the category
+forest gets extra trees grown on them; the oldest trees are dropped once the
+forest reaches ``--max-trees``. The newest ``--holdout-fraction`` of the new
+rows is held out to check for drift and to compare the updated models with
+the current ones. Every run writes a versioned bundle under ``models/``.
+
+Usage:
+    python train_incremental.py --input beneficiary_data.csv --promote
+"""
+import argparse
+import copy
+import os
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error
+
+from features import FEATURE_COLUMNS, encode_frame
+from model_store import (MANIFEST_FILE, MODEL_FILES, load_artifacts, load_manifest, model_version,
+                         save_artifacts, save_manifest)
+
+
+def evaluate(artifacts, X, y_score, y_cat):
+    frame = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    return {
+        'mae': round(float(mean_absolute_error(y_score, artifacts['score_model'].predict(frame))), 4),
+        'accuracy': round(float((artifacts['cat_model'].predict(frame) == y_cat).mean()), 4),
+    }
+
+
+def update_models(artifacts, X, y_score, y_cat, new_stages, new_trees, max_trees):
+    """Copies of the models extended with stages/trees fit on X only"""
+    updated = dict(artifacts)
+    frame = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+
+    score_model = copy.deepcopy(artifacts['score_model'])
+    score_model.set_params(warm_start=True, n_estimators=score_model.n_estimators_ + new_stages)
+    # Existing stages only predict on the new rows; the new stages fit their residuals
+    score_model.fit(frame, y_score)
+    updated['score_model'] = score_model
+
+    cat_model = artifacts['cat_model']
+    if set(np.unique(y_cat)) == set(cat_model.classes_):
+        cat_model = copy.deepcopy(cat_model)
+        cat_model.set_params(warm_start=True, n_estimators=len(cat_model.estimators_) + new_trees)
+        cat_model.fit(frame, y_cat)
+        if len(cat_model.estimators_) > max_trees:
+            cat_model.estimators_ = cat_model.estimators_[-max_trees:]
+            cat_model.n_estimators = max_trees
+        updated['cat_model'] = cat_model
+    else:
+        # New trees would encode a different class set than the existing ones
+        print("[WARN] New rows do not cover every risk category; category model left unchanged")
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally update the risk models")
+    parser.add_argument('--input', default='beneficiary_data.csv')
+    parser.add_argument('--since', help="Only use rows updated after this timestamp "
+                                        f"(default: trained_through from {MANIFEST_FILE})")
+    parser.add_argument('--holdout-fraction', type=float, default=0.2)
+    parser.add_argument('--new-stages', type=int, default=20)
+    parser.add_argument('--new-trees', type=int, default=20)
+    parser.add_argument('--max-trees', type=int, default=200)
+    parser.add_argument('--drift-tolerance', type=float, default=0.15,
+                        help="Relative MAE increase on the holdout window that counts as drift")
+    parser.add_argument('--max-accuracy-drop', type=float, default=0.02,
+                        help="Largest holdout category accuracy loss still allowed when promoting")
+    parser.add_argument('--bundle-dir', default='models')
+    parser.add_argument('--promote', action='store_true',
+                        help="Install the bundle as the serving models unless it is worse on the holdout")
+    args = parser.parse_args()
+
+    manifest = load_manifest()
+    since = args.since or (manifest or {}).get('trained_through')
+    if since is None:
+        parser.error(f"No {MANIFEST_FILE} found; pass --since or run train_model.py")
+
+    roster = pd.read_csv(args.input)
+    new = roster[roster['last_updated'].astype(str) > since].sort_values('last_updated', kind='stable')
+    if new.empty:
+        print(f"[OK] No assessments updated after {since}; models unchanged")
+        return
+
+    artifacts = load_artifacts()
+    parent = model_version()
+    X, valid = encode_frame(new, artifacts['le_age'], artifacts['le_region'], artifacts['le_gender'])
+    if not valid.all():
+        # The encoders cannot grow without renumbering the codes the trees split on
+        print(f"[WARN] Skipping {int((~valid).sum())} rows with unseen age group/region/gender; "
+              f"run train_model.py to learn new categories")
+    new, X = new[valid], X[valid]
+
+    # The most recent window is held out; the rest is used for training
+    cutoff = new['last_updated'].iloc[max(int(len(new) * (1 - args.holdout_fraction)) - 1, 0)]
+    train = (new['last_updated'] <= cutoff).to_numpy()
+    if train.all() or not train.any():
+        parser.error("New rows span too few update times to split off a holdout window")
+    y_score, y_cat = new['risk_score'].to_numpy(), new['risk_category'].to_numpy()
+    print(f"Training on {int(train.sum()):,} new rows (through {cutoff}), "
+          f"holding out {int((~train).sum()):,}; {len(roster):,} rows in total history\n")
+
+    current = evaluate(artifacts, X[~train], y_score[~train], y_cat[~train])
+    reference = (manifest or {}).get('metrics') or evaluate(artifacts, X[train], y_score[train], y_cat[train])
+    drift = current['mae'] > reference['mae'] * (1 + args.drift_tolerance)
+    print(f"[INFO] Current models on holdout: MAE {current['mae']:.3f} (reference {reference['mae']:.3f}), "
+          f"accuracy {current['accuracy']:.3f} (reference {reference['accuracy']:.3f})")
+    if drift:
+        print("[WARN] Drift: holdout error is well above the reference; consider a full retrain")
+
+    started = time.perf_counter()
+    updated = update_models(artifacts, X[train], y_score[train], y_cat[train],
+                            args.new_stages, args.new_trees, args.max_trees)
+    fit_seconds = time.perf_counter() - started
+    candidate = evaluate(updated, X[~train], y_score[~train], y_cat[~train])
+    print(f"[INFO] Updated models on holdout: MAE {candidate['mae']:.3f}, accuracy {candidate['accuracy']:.3f} "
+          f"(fit {fit_seconds:.2f}s)")
+
+    staging = os.path.join(args.bundle_dir, 'staging')
+    files = save_artifacts(updated, staging)
+    version = model_version(files)
+    bundle = os.path.join(args.bundle_dir, version)
+    if os.path.exists(bundle):
+        shutil.rmtree(staging)
+    else:
+        os.replace(staging, bundle)
+
+    bundle_manifest = {
+        'version': version,
+        'parent': parent,
+        'created': datetime.now().isoformat(),
+        'trained_through': cutoff,
+        'rows': int(train.sum()),
+        'estimators': {'score_model': int(updated['score_model'].n_estimators_),
+                       'cat_model': len(updated['cat_model'].estimators_)},
+        'fit_seconds': round(fit_seconds, 3),
+        'metrics': candidate,
+        'holdout': {'rows': int((~train).sum()), 'parent_metrics': current,
+                    'reference_metrics': reference, 'drift': bool(drift)},
+    }
+    save_manifest(bundle_manifest, os.path.join(bundle, MANIFEST_FILE))
+    print(f"[OK] Bundle saved to: {bundle}")
+
+    if args.promote:
+        if (candidate['mae'] > current['mae']
+                or candidate['accuracy'] < current['accuracy'] - args.max_accuracy_drop):
+            print("[WARN] Updated models are worse on the holdout; not promoted")
+            return
+        for name, path in MODEL_FILES.items():
+            shutil.copyfile(os.path.join(bundle, path), path)
+        save_manifest(bundle_manifest)
+        print(f"[OK] Promoted {version}; POST /models/reload to serve it")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,10 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import classification_report, mean_absolute_error
 import joblib
+import json
+import os
+from model_store import model_version, save_manifest
+from drift_monitor import build_baseline, save_baseline
 
 # Load data
 df = pd.read_csv('beneficiary_data.csv')
@@ -35,12 +39,20 @@ y_category = df['risk_category']
 X_train, X_test, y_score_train, y_score_test, y_cat_train, y_cat_test = \
     train_test_split(X, y_score, y_category, test_size=0.2, random_state=42)
 
+# Hyperparameters; tune_models.py --write-params saves tuned ones to model_params.json
+score_params = {'n_estimators': 100, 'max_depth': 5, 'learning_rate': 0.1}
+cat_params = {'n_estimators': 100, 'max_depth': 10}
+if os.path.exists('model_params.json'):
+    with open('model_params.json') as f:
+        tuned = json.load(f)
+    score_params.update(tuned.get('score_model', {}))
+    cat_params.update(tuned.get('cat_model', {}))
+    print(f"[INFO] Using tuned parameters from model_params.json: {tuned}\n")
+
 # Train Risk Score Regressor
 print("Training Risk Score Predictor...")
 score_model = GradientBoostingRegressor(
-    n_estimators=100,
-    max_depth=5,
-    learning_rate=0.1,
+    **score_params,
     random_state=42
 )
 score_model.fit(X_train, y_score_train)
@@ -54,8 +66,7 @@ print(f"   Average prediction error: +/-{mae:.1f} points\n")
 # Train Risk Category Classifier
 print("Training Risk Category Classifier...")
 cat_model = RandomForestClassifier(
-    n_estimators=100,
-    max_depth=10,
+    **cat_params,
     random_state=42
 )
 cat_model.fit(X_train, y_cat_train)
@@ -81,4 +92,19 @@ joblib.dump(le_age, 'encoder_age.pkl')
 joblib.dump(le_region, 'encoder_region.pkl')
 joblib.dump(le_gender, 'encoder_gender.pkl')
 
+# Record what the models were trained on, so train_incremental.py can pick up from here
+save_manifest({
+    'version': model_version(),
+    'parent': None,
+    'trained_through': df['last_updated'].max(),
+    'rows': len(df),
+    'metrics': {
+        'mae': round(float(mae), 4),
+        'accuracy': round(float((y_pred_cat == y_cat_test).mean()), 4)
+    }
+})
+
+# Input distributions the API's drift monitor compares live traffic against
+save_baseline(build_baseline(df))
+
 print("\n[OK] Models saved successfully!")
\ No newline at end of file
@@ -0,0 +1,252 @@
+"""Interchangeable translation backends with a configurable fallback order.
+
+Every backend implements ``translate_batch(texts, target_lang, source_lang)``
+and returns one entry per text: the translation, or None when it cannot
+translate that text. ``TranslatorChain`` passes the misses on to the next
+backend and keeps the original text for anything no backend translated.
+
+- ``phrases``: offline lookup in the curated phrase table written by
+  ``build_phrase_table.py``; templates with ``{placeholders}`` match any
+  filled-in message and the values are carried over
+- ``google``: Google Translate through deep-translator; in batch mode all
+  strings are joined into one request per 4,500 characters
+"""
+import json
+import os
+import re
+import threading
+import time
+
+from deep_translator import GoogleTranslator
+
+SUPPORTED_LANGUAGES = {
+    'en': 'English',
+    'hi': 'हिंदी (Hindi)',
+    'ta': 'தமிழ் (Tamil)',
+    'te': 'తెలుగు (Telugu)',
+    'kn': 'ಕನ್ನಡ (Kannada)',
+    'ml': 'മലയാളം (Malayalam)',
+    'mr': 'मराठी (Marathi)',
+    'bn': 'বাংলা (Bengali)',
+    'gu': 'ગુજરાતી (Gujarati)',
+    'pa': 'ਪੰਜਾਬੀ (Punjabi)',
+    'or': 'ଓଡ଼ିଆ (Odia)',
+    'as': 'অসমীয়া (Assamese)',
+    'ur': 'اردو (Urdu)'
+}
+
+PHRASE_TABLE_FILE = 'translations.json'
+# Fallback order unless NOURISHAI_TRANSLATORS says otherwise
+DEFAULT_TRANSLATORS = 'phrases,google'
+# Google rejects requests over 5,000 characters
+MAX_BATCH_CHARS = 4500
+_PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+
+def placeholders(template):
+    return _PLACEHOLDER.findall(template)
+
+
+def load_phrase_table(path=PHRASE_TABLE_FILE):
+    """{language: {english template: translated template}}, empty if the file is missing"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_phrase_table(table, path=PHRASE_TABLE_FILE):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+
+
+class PhraseTableTranslator:
+    """Offline translations of known English messages from a phrase table"""
+
+    name = 'phrases'
+
+    def __init__(self, table):
+        self.table = table
+        self._exact = {}
+        self._templates = {}
+        for lang, phrases in table.items():
+            self._exact[lang] = {source: target for source, target in phrases.items()
+                                 if not placeholders(source)}
+            self._templates[lang] = [(self._pattern(source), target) for source, target in phrases.items()
+                                     if placeholders(source)]
+
+    @classmethod
+    def from_file(cls, path=PHRASE_TABLE_FILE):
+        return cls(load_phrase_table(path))
+
+    @staticmethod
+    def _pattern(template):
+        parts = _PLACEHOLDER.split(template)
+        # split() alternates literal text and placeholder names
+        regex = ''.join(re.escape(part) if i % 2 == 0 else f'(?P<{part}>.+?)' for i, part in enumerate(parts))
+        return re.compile(regex + r'\Z')
+
+    def translate_one(self, text, target_lang):
+        exact = self._exact.get(target_lang)
+        if exact is None:
+            return None
+        if text in exact:
+            return exact[text]
+        for pattern, target in self._templates[target_lang]:
+            match = pattern.match(text)
+            if match:
+                return target.format(**match.groupdict())
+        return None
+
+    def translate_batch(self, texts, target_lang, source_lang='auto'):
+        # The table only maps English messages
+        if source_lang not in ('en', 'auto'):
+            return [None] * len(texts)
+        return [self.translate_one(text, target_lang) for text in texts]
+
+    def stats(self):
+        return {'languages': len(self.table), 'phrases': sum(len(p) for p in self.table.values())}
+
+
+class GoogleTranslateBackend:
+    """Google Translate, one request per string or one per batch of strings.
+
+    After a failed request the backend reports misses for ``retry_after``
+    seconds, so an outage costs one timeout rather than one per string.
+    """
+
+    name = 'google'
+
+    def __init__(self, batch=True, retry_after=30.0):
+        self.batch = batch
+        self.retry_after = retry_after
+        self._failed_at = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def _available(self):
+        return self._failed_at is None or time.monotonic() - self._failed_at >= self.retry_after
+
+    def _request(self, text, target_lang, source_lang):
+        with self._lock:
+            self.requests += 1
+        try:
+            result = GoogleTranslator(source=source_lang, target=target_lang).translate(text)
+        except Exception as e:
+            print(f"Translation error: {e}")
+            with self._lock:
+                self.errors += 1
+                self._failed_at = time.monotonic()
+            return None
+        self._failed_at = None
+        return result
+
+    def _chunks(self, indices, texts):
+        chunk, size = [], 0
+        for i in indices:
+            if chunk and size + len(texts[i]) + 1 > MAX_BATCH_CHARS:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(i)
+            size += len(texts[i]) + 1
+        if chunk:
+            yield chunk
+
+    def translate_batch(self, texts, target_lang, source_lang='auto'):
+        results = [None] * len(texts)
+        if not self._available():
+            return results
+        single = list(range(len(texts)))
+        if self.batch:
+            # Strings are joined one per line, so only single-line strings can share a request
+            joinable = [i for i, text in enumerate(texts) if '\n' not in text and len(text) < MAX_BATCH_CHARS]
+            single = sorted(set(single) - set(joinable))
+            for chunk in self._chunks(joinable, texts):
+                if len(chunk) == 1:
+                    single.append(chunk[0])
+                    continue
+                translated = self._request('\n'.join(texts[i] for i in chunk), target_lang, source_lang)
+                lines = translated.split('\n') if translated else []
+                if len(lines) == len(chunk):
+                    for i, line in zip(chunk, lines):
+                        results[i] = line.strip()
+                elif translated is not None:
+                    # Lines were merged or split by the service; fall back to one request each
+                    single.extend(chunk)
+        for i in sorted(single):
+            if not self._available():
+                break
+            results[i] = self._request(texts[i], target_lang, source_lang)
+        return results
+
+    def stats(self):
+        return {'batch': self.batch, 'requests': self.requests, 'errors': self.errors,
+                'available': self._available()}
+
+
+BACKENDS = {
+    'phrases': lambda: PhraseTableTranslator.from_file(os.environ.get('NOURISHAI_PHRASE_TABLE', PHRASE_TABLE_FILE)),
+    'google': lambda: GoogleTranslateBackend(batch=os.environ.get('NOURISHAI_TRANSLATE_BATCH', '1') == '1'),
+}
+
+
+class TranslatorChain:
+    """Tries each backend in order on the strings the previous ones could not translate"""
+
+    def __init__(self, backends):
+        self.backends = backends
+        self._lock = threading.Lock()
+        self.hits = {backend.name: 0 for backend in backends}
+        self.misses = 0
+
+    @classmethod
+    def from_names(cls, names=None):
+        """Chain from a comma-separated list such as ``"phrases,google"``
+        (default: NOURISHAI_TRANSLATORS, then DEFAULT_TRANSLATORS)"""
+        if names is None:
+            names = os.environ.get('NOURISHAI_TRANSLATORS', DEFAULT_TRANSLATORS)
+        names = [name.strip() for name in names.split(',') if name.strip()]
+        unknown = [name for name in names if name not in BACKENDS]
+        if unknown:
+            raise ValueError(f"Unknown translators {unknown}; choose from {list(BACKENDS)}")
+        return cls([BACKENDS[name]() for name in names])
+
+    def translate_batch(self, texts, target_lang, source_lang='auto'):
+        return self.translate_checked(texts, target_lang, source_lang)[0]
+
+    def translate_checked(self, texts, target_lang, source_lang='auto'):
+        """(translations, complete): complete is False when any text was left untranslated"""
+        results, translated = self.translate_each(texts, target_lang, source_lang)
+        return results, all(translated)
+
+    def translate_each(self, texts, target_lang, source_lang='auto'):
+        """(translations, translated): one flag per text, False where the original was kept"""
+        results = list(texts)
+        pending = list(range(len(texts)))
+        hits = {}
+        for backend in self.backends:
+            if not pending:
+                break
+            translated = backend.translate_batch([texts[i] for i in pending], target_lang, source_lang)
+            still_pending = []
+            for i, result in zip(pending, translated):
+                if result is None:
+                    still_pending.append(i)
+                else:
+                    results[i] = result
+            hits[backend.name] = len(pending) - len(still_pending)
+            pending = still_pending
+        with self._lock:
+            for name, n in hits.items():
+                self.hits[name] += n
+            self.misses += len(pending)
+        untranslated = set(pending)
+        return results, [i not in untranslated for i in range(len(texts))]
+
+    def stats(self):
+        with self._lock:
+            return {'order': [backend.name for backend in self.backends], 'hits': dict(self.hits),
+                    'untranslated': self.misses,
+                    'backends': {backend.name: backend.stats() for backend in self.backends}}
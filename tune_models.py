@@ -0,0 +1,218 @@
+"""Hyperparameter search for both models, trading accuracy against serving cost.
+
+Every candidate is cross-validated in parallel across all cores (MAE for the
+risk score regressor, macro F1 for the category classifier). Each candidate is
+then refit on the training split and its pickled size and single-row and
+1000-row inference latency are measured one at a time, so timings are not
+skewed by the parallel fits. The report marks the Pareto-optimal candidates
+(no other candidate is at least as good on error, latency and size) and picks
+the most accurate one within ``--latency-budget-ms``.
+
+Usage:
+    python tune_models.py --latency-budget-ms 5 --write-params
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestClassifier
+from sklearn.metrics import f1_score, mean_absolute_error
+from sklearn.model_selection import KFold, StratifiedKFold, train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+from features import FEATURE_COLUMNS
+
+PARAMS_FILE = 'model_params.json'
+
+SEARCH_SPACE = {
+    'score_model': {
+        'n_estimators': [50, 100, 200],
+        'max_depth': [3, 5, 7],
+        'learning_rate': [0.05, 0.1],
+    },
+    'cat_model': {
+        'n_estimators': [50, 100, 200],
+        'max_depth': [6, 10, None],
+        'min_samples_leaf': [1, 5],
+    },
+}
+
+QUICK_SEARCH_SPACE = {
+    'score_model': {'n_estimators': [50, 100], 'max_depth': [3, 5], 'learning_rate': [0.1]},
+    'cat_model': {'n_estimators': [50, 100], 'max_depth': [6, 10], 'min_samples_leaf': [1]},
+}
+
+ESTIMATORS = {
+    'score_model': GradientBoostingRegressor(random_state=42),
+    'cat_model': RandomForestClassifier(random_state=42),
+}
+
+
+def load_training_data(path='beneficiary_data.csv'):
+    """Feature matrix and targets encoded the same way as train_model.py, and its split"""
+    df = pd.read_csv(path)
+    df['age_group_encoded'] = LabelEncoder().fit_transform(df['age_group'])
+    df['region_encoded'] = LabelEncoder().fit_transform(df['region'])
+    df['gender_encoded'] = LabelEncoder().fit_transform(df['gender'])
+    return train_test_split(df[FEATURE_COLUMNS], df['risk_score'], df['risk_category'],
+                            test_size=0.2, random_state=42)
+
+
+def candidates(space):
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def error(kind, y_true, y_pred):
+    """Lower is better for both models: MAE, or 1 - macro F1"""
+    if kind == 'score_model':
+        return mean_absolute_error(y_true, y_pred)
+    return 1.0 - f1_score(y_true, y_pred, average='macro')
+
+
+def run_fold(kind, params, X, y, train_index, test_index):
+    model = clone(ESTIMATORS[kind]).set_params(**params)
+    model.fit(X.iloc[train_index], y.iloc[train_index])
+    return error(kind, y.iloc[test_index], model.predict(X.iloc[test_index]))
+
+
+def run_fit(kind, params, X, y):
+    """Fit on the whole training split; returns the pickled model and fit time"""
+    model = clone(ESTIMATORS[kind]).set_params(**params)
+    started = time.perf_counter()
+    model.fit(X, y)
+    fit_seconds = time.perf_counter() - started
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer)
+    return buffer.getvalue(), fit_seconds
+
+
+def latency_ms(kind, model, X, repeats):
+    """Median time in milliseconds of the call the API makes for this model"""
+    predict = model.predict if kind == 'score_model' else model.predict_proba
+    predict(X)
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        predict(X)
+        samples.append((time.perf_counter() - started) * 1000)
+    return float(np.median(samples))
+
+
+def pareto_front(results):
+    """Mark results no other result beats on error, single-row latency and size at once"""
+    keys = ('cv_error', 'single_ms', 'size_kb')
+    for r in results:
+        r['pareto'] = not any(
+            all(o[k] <= r[k] for k in keys) and any(o[k] < r[k] for k in keys)
+            for o in results if o is not r
+        )
+
+
+def search(kind, space, X, y, X_test, y_test, folds, workers, repeats):
+    grid = candidates(space)
+    splitter = (StratifiedKFold if kind == 'cat_model' else KFold)(n_splits=folds, shuffle=True, random_state=42)
+    splits = list(splitter.split(X, y))
+
+    started = time.perf_counter()
+    jobs = [delayed(run_fold)(kind, params, X, y, tr, te) for params in grid for tr, te in splits]
+    jobs += [delayed(run_fit)(kind, params, X, y) for params in grid]
+    outputs = Parallel(n_jobs=workers)(jobs)
+    fold_errors = np.array(outputs[:len(grid) * folds]).reshape(len(grid), folds)
+    fits = outputs[len(grid) * folds:]
+    print(f"[OK] {kind}: {len(grid)} candidates x {folds} folds in {time.perf_counter() - started:.1f}s")
+
+    results = []
+    for params, errors, (blob, fit_seconds) in zip(grid, fold_errors, fits):
+        model = joblib.load(io.BytesIO(blob))
+        results.append({
+            'params': params,
+            'cv_error': round(float(errors.mean()), 4),
+            'cv_error_std': round(float(errors.std()), 4),
+            'test_error': round(float(error(kind, y_test, model.predict(X_test))), 4),
+            'size_kb': round(len(blob) / 1024, 1),
+            'fit_seconds': round(fit_seconds, 2),
+            'single_ms': round(latency_ms(kind, model, X_test.iloc[:1], repeats), 3),
+            'batch_ms': round(latency_ms(kind, model, X_test.iloc[:1000], max(repeats // 10, 3)), 3),
+        })
+    pareto_front(results)
+    return sorted(results, key=lambda r: r['cv_error'])
+
+
+def pick(results, budget_ms):
+    """Most accurate candidate whose single-row latency fits the budget"""
+    within = [r for r in results if budget_ms is None or r['single_ms'] <= budget_ms]
+    return min(within, key=lambda r: r['cv_error']) if within else None
+
+
+def write_markdown(path, report):
+    lines = ["# Model tuning report", ""]
+    for kind, section in report['models'].items():
+        metric = 'MAE' if kind == 'score_model' else '1 - macro F1'
+        lines += [f"## {kind} ({metric})", "",
+                  "| params | CV error | test error | size KB | single ms | batch(1000) ms | fit s | Pareto |",
+                  "|---|---|---|---|---|---|---|---|"]
+        for r in section['results']:
+            params = ', '.join(f"{k}={v}" for k, v in r['params'].items())
+            marker = '✓' if r['pareto'] else ''
+            if section['selected'] is r:
+                marker += ' ← selected'
+            lines.append(f"| {params} | {r['cv_error']} ± {r['cv_error_std']} | {r['test_error']} | "
+                         f"{r['size_kb']} | {r['single_ms']} | {r['batch_ms']} | {r['fit_seconds']} | {marker} |")
+        lines.append("")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-validated hyperparameter search with serving costs")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=-1, help="Parallel fits (-1: all cores)")
+    parser.add_argument('--repeats', type=int, default=100, help="Timing repetitions for single-row latency")
+    parser.add_argument('--latency-budget-ms', type=float, help="Single-row latency budget per model")
+    parser.add_argument('--quick', action='store_true', help="Small grid for a fast check")
+    parser.add_argument('--output', default='tuning_report')
+    parser.add_argument('--write-params', action='store_true',
+                        help=f"Save the selected parameters to {PARAMS_FILE} for train_model.py")
+    args = parser.parse_args()
+
+    space = QUICK_SEARCH_SPACE if args.quick else SEARCH_SPACE
+    X_train, X_test, y_score_train, y_score_test, y_cat_train, y_cat_test = load_training_data()
+    print(f"Searching on {len(X_train):,} rows with {os.cpu_count()} cores\n")
+
+    report = {'folds': args.folds, 'latency_budget_ms': args.latency_budget_ms, 'models': {}}
+    targets = {'score_model': (y_score_train, y_score_test), 'cat_model': (y_cat_train, y_cat_test)}
+    for kind, (y_train, y_test) in targets.items():
+        results = search(kind, space[kind], X_train, y_train, X_test, y_test,
+                         args.folds, args.workers, args.repeats)
+        selected = pick(results, args.latency_budget_ms)
+        report['models'][kind] = {'results': results, 'selected': selected}
+        if selected is None:
+            print(f"[WARN] No {kind} candidate meets the {args.latency_budget_ms} ms budget")
+        else:
+            print(f"   selected {selected['params']}: CV error {selected['cv_error']}, "
+                  f"{selected['single_ms']} ms single-row, {selected['size_kb']} KB")
+
+    with open(f"{args.output}.json", 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    write_markdown(f"{args.output}.md", report)
+    print(f"\n[OK] Report saved to: {args.output}.json, {args.output}.md")
+
+    if args.write_params:
+        params = {kind: section['selected']['params'] for kind, section in report['models'].items()
+                  if section['selected'] is not None}
+        with open(PARAMS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(params, f, indent=2)
+        print(f"[OK] Selected parameters saved to: {PARAMS_FILE}; run train_model.py to use them")
+
+
+if __name__ == "__main__":
+    main()